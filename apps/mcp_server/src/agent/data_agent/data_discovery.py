@@ -3,6 +3,7 @@ Data discovery utilities for quantified self analysis
 """
 
 import glob
+import gzip
 import os
 
 
@@ -10,15 +11,25 @@ def discover_csv_files(data_export_path: str) -> list[str]:
     """
     Dynamically discover all CSV files in the data export directory
 
+    When a table has both a plain .csv and a gzip-compressed .csv.gz
+    export, the more recently modified one is used.
+
     Args:
         data_export_path: Path to the data export directory
 
     Returns:
         List of CSV filenames (excluding metadata files)
     """
-    # Find all CSV files in the export directory
-    csv_pattern = os.path.join(data_export_path, "*.csv")
-    csv_file_paths = glob.glob(csv_pattern)
+    # Find all CSV files in the export directory, keeping the newest export per table
+    newest = {}
+    paths = glob.glob(os.path.join(data_export_path, "*.csv"))
+    paths += glob.glob(os.path.join(data_export_path, "*.csv.gz"))
+    for path in paths:
+        table_file = os.path.basename(path).removesuffix(".gz")
+        current = newest.get(table_file)
+        if current is None or os.path.getmtime(path) > os.path.getmtime(current):
+            newest[table_file] = path
+    csv_file_paths = list(newest.values())
 
     # Filter out metadata files and get just the filenames
     csv_files = []
@@ -37,6 +48,9 @@ def load_csv_files(
     """
     Load CSV file contents for upload to sandbox
 
+    Compressed .csv.gz files are decompressed and reported under their
+    plain .csv name so the sandbox sees ordinary CSV files.
+
     Args:
         data_export_path: Path to the data export directory
         csv_files: List of CSV filenames to load
@@ -49,10 +63,15 @@ def load_csv_files(
     for csv_file in csv_files:
         try:
             file_path = os.path.join(data_export_path, csv_file)
-            with open(file_path, "r") as f:
-                csv_data = f.read()
-                if csv_data.strip():  # Only include non-empty files
-                    loaded_files.append((csv_file, csv_data))
+            if csv_file.endswith(".gz"):
+                with gzip.open(file_path, "rt", encoding="utf-8") as f:
+                    csv_data = f.read()
+                csv_file = csv_file[: -len(".gz")]
+            else:
+                with open(file_path, "r") as f:
+                    csv_data = f.read()
+            if csv_data.strip():  # Only include non-empty files
+                loaded_files.append((csv_file, csv_data))
         except FileNotFoundError:
             print(f"Note: {csv_file} not found, skipping...")
         except Exception as e:
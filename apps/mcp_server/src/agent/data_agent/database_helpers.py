@@ -105,58 +105,53 @@ def _get_all_tables_overview() -> str:
         ORDER BY table_name
         """
 
-        basic_tables = get_db_helper().execute_query(basic_query)
+        helper = get_db_helper()
+        basic_tables = helper.execute_query(basic_query)
 
         if not basic_tables:
             return "📊 **No tables found**\n\nUse `create_table` to start tracking quantified self data."
 
-        # Get enhanced info for each table
+        table_names = tuple(row["table_name"] for row in basic_tables)
+
+        # Fetch metadata and column counts for all tables in one round trip each
+        try:
+            metadata_query = """
+            SELECT table_name, description, purpose
+            FROM table_metadata 
+            WHERE table_name IN %s
+            """
+            metadata_lookup = {
+                row["table_name"]: row
+                for row in helper.execute_query(metadata_query, (table_names,))
+            }
+        except Exception as e:
+            print(f"Warning: Error getting table metadata: {e}")
+            helper.connection.rollback()
+            metadata_lookup = {}
+
+        column_query = """
+        SELECT table_name, COUNT(*) as column_count
+        FROM information_schema.columns
+        WHERE table_name IN %s AND table_schema = 'public'
+        GROUP BY table_name
+        """
+        column_counts = {
+            row["table_name"]: row["column_count"]
+            for row in helper.execute_query(column_query, (table_names,))
+        }
+
         tables = []
-        for table_row in basic_tables:
-            table_name = table_row["table_name"]
-
-            try:
-                # Get metadata if exists
-                metadata_query = """
-                SELECT description, purpose
-                FROM table_metadata 
-                WHERE table_name = %s
-                """
-                metadata = db_helper.execute_query(metadata_query, (table_name,))
-
-                # Get column count
-                column_query = """
-                SELECT COUNT(*) as column_count
-                FROM information_schema.columns
-                WHERE table_name = %s AND table_schema = 'public'
-                """
-                column_info = db_helper.execute_query(column_query, (table_name,))
-
-                table_info = {
+        for table_name in table_names:
+            metadata = metadata_lookup.get(table_name, {})
+            tables.append(
+                {
                     "table_name": table_name,
-                    "description": metadata[0]["description"]
-                    if metadata and len(metadata) > 0 and metadata[0]["description"]
-                    else "No description",
-                    "purpose": metadata[0]["purpose"]
-                    if metadata and len(metadata) > 0 and metadata[0]["purpose"]
-                    else "No purpose defined",
+                    "description": metadata.get("description") or "No description",
+                    "purpose": metadata.get("purpose") or "No purpose defined",
                     "ai_learnings": "{}",  # Empty for now since ai_learnings column doesn't exist
-                    "column_count": column_info[0]["column_count"]
-                    if column_info and len(column_info) > 0
-                    else 0,
-                }
-                tables.append(table_info)
-            except Exception as e:
-                print(f"Warning: Error getting info for table {table_name}: {e}")
-                # Add basic info even if metadata fails
-                table_info = {
-                    "table_name": table_name,
-                    "description": "No description",
-                    "purpose": "No purpose defined",
-                    "ai_learnings": "{}",
-                    "column_count": 0,
+                    "column_count": column_counts.get(table_name, 0),
                 }
-                tables.append(table_info)
+            )
 
         if not tables:
             return "📊 **No tables found**\n\nUse `create_table` to start tracking quantified self data."
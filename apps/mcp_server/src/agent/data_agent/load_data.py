@@ -33,14 +33,26 @@ class DataLoader:
         else:
             return pd.DataFrame()
 
+    def _table_path(self, table_name: str) -> Optional[str]:
+        """Path of the most recently written export of a table, if any"""
+        candidates = [
+            path
+            for path in (
+                os.path.join(self.data_dir, f"{table_name}.csv"),
+                os.path.join(self.data_dir, f"{table_name}.csv.gz"),
+            )
+            if os.path.exists(path)
+        ]
+        return max(candidates, key=os.path.getmtime, default=None)
+
     def load_table(
         self, table_name: str, parse_dates: bool = True
     ) -> Optional[pd.DataFrame]:
-        """Load a specific table"""
-        csv_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        """Load a specific table from its newest .csv or .csv.gz export"""
+        csv_path = self._table_path(table_name)
 
-        if not os.path.exists(csv_path):
-            print(f"❌ Table {table_name} not found at {csv_path}")
+        if csv_path is None:
+            print(f"❌ Table {table_name} not found in {self.data_dir}")
             return None
 
         try:
@@ -3,6 +3,9 @@ End of day analysis workflow for quantified self data
 """
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Any, Dict, Optional
 
 import requests
@@ -18,10 +21,15 @@ from .data_agent.html_generator import (
     generate_html_report_content,
 )
 
+REPORTS_DIR = "reports"
+
 
 class EndOfDayAnalyzer:
     """Handles end-of-day analysis and email delivery via n8n"""
 
+    # Set once the reports directory has been created in this process
+    _reports_dir_ready = False
+
     def __init__(self, n8n_webhook_url: Optional[str] = None):
         self.n8n_webhook_url = n8n_webhook_url
         self.runner = AnalysisRunner()
@@ -183,27 +191,6 @@ TONE: Encouraging, insightful, and actionable - this is a daily review to motiva
         if not html_content:
             html_content = "Your daily health analysis is ready."
 
-        # Save HTML to file
-        try:
-            import os
-            from datetime import datetime
-
-            # Create reports directory if it doesn't exist
-            reports_dir = "reports"
-            os.makedirs(reports_dir, exist_ok=True)
-
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            html_filename = f"{reports_dir}/daily_health_report_{timestamp}.html"
-
-            with open(html_filename, "w", encoding="utf-8") as f:
-                f.write(html_content)
-
-            print(f"📄 HTML report saved to: {html_filename}")
-
-        except Exception as e:
-            print(f"⚠️ Failed to save HTML report: {e}")
-
         # Prepare payload for n8n - ensure email is always a string
         payload = {"email": str(html_content).strip()}
 
@@ -213,45 +200,70 @@ TONE: Encouraging, insightful, and actionable - this is a daily review to motiva
         print(f"   - Email content length: {len(html_content) if html_content else 0}")
         print(f"   - Charts count: {len(charts)}")
 
-        try:
-            response = requests.post(
-                self.n8n_webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=120,  # Increase timeout to 2 minutes for email processing
-            )
-
-            print(f"🔍 n8n Response:")
-            print(f"   - Status: {response.status_code}")
-            print(f"   - Response text: {response.text}")
-
-            if response.status_code == 200:
+        # Save the HTML report in the background while the webhook request is in flight;
+        # leaving the executor block waits for the write to finish
+        with ThreadPoolExecutor(max_workers=1) as report_writer:
+            report_writer.submit(self._save_html_report, html_content)
+
+            try:
+                response = requests.post(
+                    self.n8n_webhook_url,
+                    json=payload,
+                    headers={"Content-Type": "application/json"},
+                    timeout=120,  # Increase timeout to 2 minutes for email processing
+                )
+
+                print(f"🔍 n8n Response:")
+                print(f"   - Status: {response.status_code}")
+                print(f"   - Response text: {response.text}")
+
+                if response.status_code == 200:
+                    return {
+                        "success": True,
+                        "message": "Analysis sent to email workflow successfully",
+                        "response": response.json() if response.content else {},
+                    }
+                else:
+                    return {
+                        "success": False,
+                        "error": f"n8n webhook failed with status {response.status_code}: {response.text}",
+                    }
+
+            except requests.exceptions.Timeout:
+                print(
+                    f"⚠️ n8n webhook timeout (120s) - email workflow may still be processing"
+                )
                 return {
-                    "success": True,
-                    "message": "Analysis sent to email workflow successfully",
-                    "response": response.json() if response.content else {},
+                    "success": True,  # Consider it successful since webhook received the data
+                    "message": "Email workflow started (timeout occurred but processing continues)",
+                    "warning": "Webhook timed out after 120s but n8n workflow is likely still processing the email",
                 }
-            else:
+            except requests.exceptions.RequestException as e:
+                print(f"❌ n8n webhook error: {str(e)}")
                 return {
                     "success": False,
-                    "error": f"n8n webhook failed with status {response.status_code}: {response.text}",
+                    "error": f"Failed to send to n8n workflow: {str(e)}",
                 }
 
-        except requests.exceptions.Timeout:
-            print(
-                f"⚠️ n8n webhook timeout (120s) - email workflow may still be processing"
-            )
-            return {
-                "success": True,  # Consider it successful since webhook received the data
-                "message": "Email workflow started (timeout occurred but processing continues)",
-                "warning": "Webhook timed out after 120s but n8n workflow is likely still processing the email",
-            }
-        except requests.exceptions.RequestException as e:
-            print(f"❌ n8n webhook error: {str(e)}")
-            return {
-                "success": False,
-                "error": f"Failed to send to n8n workflow: {str(e)}",
-            }
+    def _save_html_report(self, html_content: str) -> None:
+        """Save the HTML report to the reports directory"""
+        try:
+            # Create reports directory once per process
+            if not EndOfDayAnalyzer._reports_dir_ready:
+                os.makedirs(REPORTS_DIR, exist_ok=True)
+                EndOfDayAnalyzer._reports_dir_ready = True
+
+            # Generate filename with timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            html_filename = f"{REPORTS_DIR}/daily_health_report_{timestamp}.html"
+
+            with open(html_filename, "w", encoding="utf-8") as f:
+                f.write(html_content)
+
+            print(f"📄 HTML report saved to: {html_filename}")
+
+        except Exception as e:
+            print(f"⚠️ Failed to save HTML report: {e}")
 
     def run_end_of_day_analysis(self, focus: Optional[str] = None) -> str:
         """
@@ -4,15 +4,16 @@ Export database tables to CSV files for analysis
 """
 
 import os
-import csv
+import gzip
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
 load_dotenv()
 
 def export_table_to_csv(table_name: str, output_dir: str = "data/export"):
-    """Export a database table to CSV file"""
+    """Export a database table to a gzip-compressed CSV file"""
     
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
@@ -23,24 +24,36 @@ def export_table_to_csv(table_name: str, output_dir: str = "data/export"):
         raise EnvironmentError("DATABASE_URL not found in environment variables")
     
     try:
-        with psycopg2.connect(database_url, cursor_factory=RealDictCursor) as conn:
+        with psycopg2.connect(database_url) as conn:
             with conn.cursor() as cursor:
-                # Get all data from table
-                cursor.execute(f"SELECT * FROM {table_name} ORDER BY created_at")
-                rows = cursor.fetchall()
+                table = sql.Identifier(table_name)
                 
-                if not rows:
+                # Cheap probe so empty tables never open an export file
+                cursor.execute(sql.SQL("SELECT 1 FROM {table} LIMIT 1").format(table=table))
+                if cursor.fetchone() is None:
                     print(f"⚠️  Table '{table_name}' is empty - skipping")
                     return
                 
-                # Write to CSV
-                csv_file = os.path.join(output_dir, f"{table_name}.csv")
-                with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-                    writer.writeheader()
-                    writer.writerows(rows)
+                # Quote the table name as an identifier so the statement text stays safe
+                copy_query = sql.SQL(
+                    "COPY (SELECT * FROM {table} ORDER BY created_at) TO STDOUT WITH CSV HEADER"
+                ).format(table=table)
+                
+                # Stream rows straight from the server through a fast gzip writer
+                # into a temp file, then swap it in; a failed COPY never leaves
+                # a truncated archive where data discovery would pick it up
+                csv_file = os.path.join(output_dir, f"{table_name}.csv.gz")
+                temp_file = csv_file + ".tmp"
+                try:
+                    with gzip.open(temp_file, 'wb', compresslevel=1) as f:
+                        cursor.copy_expert(copy_query.as_string(cursor), f)
+                    os.replace(temp_file, csv_file)
+                except Exception:
+                    if os.path.exists(temp_file):
+                        os.unlink(temp_file)
+                    raise
                 
-                print(f"✅ Exported {len(rows)} rows from '{table_name}' to {csv_file}")
+                print(f"✅ Exported {cursor.rowcount} rows from '{table_name}' to {csv_file}")
                 
     except Exception as e:
         print(f"❌ Error exporting {table_name}: {e}")
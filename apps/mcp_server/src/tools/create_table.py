@@ -1,6 +1,18 @@
+from functools import lru_cache
+from typing import Tuple
+
 from mcp import Tool
+from psycopg2 import sql
 from ..database import db
-from .table_metadata import store_metadata
+from .identifiers import normalize_data_type, normalize_identifier
+from .table_metadata import COLUMN_METADATA_UPSERT_SQL, TABLE_METADATA_UPSERT_SQL
+
+# Every table gets created_at and date; index both for the newest-first sample
+# in list_tables and the date-ordered queries in query_data
+CREATE_INDEXES_SQL = sql.SQL("""
+    CREATE INDEX ON {table} (created_at DESC);
+    CREATE INDEX ON {table} (date DESC)
+    """)
 
 CREATE_TABLE_TOOL = Tool(
     name="create_table",
@@ -76,48 +88,86 @@ async def handle_create_table(arguments: dict) -> str:
         purpose = arguments.get('purpose', '')
         columns = arguments['columns']
         
-        # Build CREATE TABLE statement
-        sql_columns = [
-            "id UUID PRIMARY KEY DEFAULT uuid_generate_v4()",
-            "date TIMESTAMP NOT NULL",
-        ]
-        
-        # Add custom columns
+        # Reject unsafe names and unknown types before touching the database
+        normalized_table = normalize_identifier(table_name)
+        if not normalized_table:
+            return f"❌ Error: Invalid table name '{table_name}' (use letters, digits and underscores, not a reserved word)"
+        table_name = normalized_table
         for col in columns:
-            col_def = f"{col['name']} {col['type']}"
-            if col.get('required', False):
-                col_def += " NOT NULL"
-            sql_columns.append(col_def)
-        
-        # Always add created_at
-        sql_columns.append("created_at TIMESTAMP DEFAULT NOW()")
+            column_name = normalize_identifier(col['name'])
+            if not column_name:
+                return f"❌ Error: Invalid column name '{col['name']}' (use letters, digits and underscores, not a reserved word)"
+            col['name'] = column_name
+            data_type = normalize_data_type(col['type'])
+            if not data_type:
+                return f"❌ Error: Unsupported type '{col['type']}' for column '{col['name']}'"
+            col['type'] = data_type
         
-        create_sql = f"""
-        CREATE TABLE {table_name} (
-            {', '.join(sql_columns)}
-        )
-        """
-        
-        # Execute table creation
-        success = await db.execute_query(create_sql)
-        if not success:
-            return f"❌ Error creating table: Database execution failed"
+        # Build CREATE TABLE statement from the cached template for this column shape
+        column_shape = tuple((col['type'], bool(col.get('required', False))) for col in columns)
+        create_sql = sql.SQL(";").join([
+            _create_table_template(column_shape).format(
+                sql.Identifier(table_name),
+                *(sql.Identifier(col['name']) for col in columns)
+            ),
+            CREATE_INDEXES_SQL.format(table=sql.Identifier(table_name)),
+        ])
         
-        # Store table metadata with AI learning structure
-        initial_learnings = {
-            "creation_context": f"Created for {purpose}",
-            "column_purposes": {col['name']: col['description'] for col in columns},
-            "data_types_chosen": {col['name']: col['type'] for col in columns}
-        }
+        column_metadata = [
+            (table_name, col['name'], col['description'], col['type'], col.get('units'))
+            for col in columns
+        ]
         
-        await store_metadata(
-            table_name=table_name,
-            description=description,
-            purpose=purpose,
-            ai_learnings=initial_learnings
+        # Create the table and record its metadata in one transaction
+        await db.run_in_transaction(
+            _create_table_with_metadata,
+            create_sql,
+            (table_name, description, purpose),
+            column_metadata
         )
         
+        await db.refresh_schema_cache()
+        
         return f"✅ Created table '{table_name}' with {len(columns)} custom columns plus standard fields (id, date, created_at)"
         
     except Exception as e:
-        return f"❌ Error creating table: {str(e)}"
\ No newline at end of file
+        return f"❌ Error creating table: {str(e)}"
+
+
+@lru_cache(maxsize=128)
+def _create_table_template(column_shape: Tuple[Tuple[str, bool], ...]) -> sql.SQL:
+    """CREATE TABLE for a (type, required) column shape; the {} slots take the table then column identifiers"""
+    sql_columns = [
+        "id UUID PRIMARY KEY DEFAULT uuid_generate_v4()",
+        "date TIMESTAMP NOT NULL",
+    ]
+    
+    # Add custom columns
+    for data_type, required in column_shape:
+        col_def = f"{{}} {data_type}"
+        if required:
+            col_def += " NOT NULL"
+        sql_columns.append(col_def)
+    
+    # Always add created_at
+    sql_columns.append("created_at TIMESTAMP DEFAULT NOW()")
+    
+    return sql.SQL(f"""
+        CREATE TABLE {{}} (
+            {', '.join(sql_columns)}
+        )
+        """)
+
+
+def _create_table_with_metadata(cursor, create_sql: sql.Composed, table_metadata: tuple, column_metadata: list) -> None:
+    """Send CREATE TABLE plus the table and column metadata writes as one batch"""
+    statements = [
+        create_sql.as_string(cursor).encode(),
+        cursor.mogrify(TABLE_METADATA_UPSERT_SQL, table_metadata),
+    ]
+    if column_metadata:
+        values = b",".join(cursor.mogrify("(%s, %s, %s, %s, %s)", row) for row in column_metadata)
+        statements.append(COLUMN_METADATA_UPSERT_SQL.encode().replace(b"%s", values))
+    
+    # A single execute sends every statement in one round trip
+    cursor.execute(b";".join(statements))
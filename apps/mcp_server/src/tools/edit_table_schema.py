@@ -1,7 +1,12 @@
 """Edit table schema tool - comprehensive schema modifications"""
 
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Set, Tuple
+from psycopg2 import sql
+from psycopg2.extras import execute_values
 from ..database import db
+from .identifiers import normalize_data_type, normalize_identifier
+from .table_metadata import COLUMN_METADATA_UPSERT_SQL
 
 
 async def handle_edit_table_schema(args: Dict[str, Any]) -> str:
@@ -20,53 +25,22 @@ async def handle_edit_table_schema(args: Dict[str, Any]) -> str:
     if not operations:
         return "❌ Error: operations list is required"
     
-    if not db.conn:
-        return "❌ Error: Database not connected"
+    normalized_table = normalize_identifier(table_name)
+    if not normalized_table:
+        return f"❌ Error: Invalid table name '{table_name}'"
+    table_name = normalized_table
+    
+    # Validate every operation up front so bad input never opens a transaction
+    for i, operation in enumerate(operations):
+        error = _validate_operation(operation)
+        if error:
+            return f"❌ Error: {error} at index {i}"
     
     try:
-        cursor = db.conn.cursor()
-        
-        # Start transaction for atomic operations
-        cursor.execute("BEGIN;")
-        
-        results = []
-        
-        for i, operation in enumerate(operations):
-            action = operation.get("action")
-            
-            if action == "add_column":
-                result = await _add_column(cursor, table_name, operation)
-                results.append(f"✅ Added column '{operation.get('name')}'")
-                
-            elif action == "remove_column":
-                result = await _remove_column(cursor, table_name, operation)
-                results.append(f"✅ Removed column '{operation.get('name')}'")
-                
-            elif action == "rename_column":
-                result = await _rename_column(cursor, table_name, operation)
-                results.append(f"✅ Renamed column '{operation.get('old_name')}' to '{operation.get('new_name')}'")
-                
-            elif action == "change_column_type":
-                result = await _change_column_type(cursor, table_name, operation)
-                results.append(f"✅ Changed column '{operation.get('name')}' type to {operation.get('new_type')}")
-                
-            elif action == "rename_table":
-                new_name = operation.get("new_name")
-                cursor.execute(f"ALTER TABLE {table_name} RENAME TO {new_name};")
-                results.append(f"✅ Renamed table '{table_name}' to '{new_name}'")
-                table_name = new_name  # Update for subsequent operations
-                
-            else:
-                cursor.execute("ROLLBACK;")
-                return f"❌ Error: Unknown operation '{action}' at index {i}"
-        
-        # Commit all operations
-        cursor.execute("COMMIT;")
-        
-        # Update metadata for schema changes
-        await _update_table_metadata(cursor, table_name)
+        # Run every operation in one pooled transaction: all succeed or all roll back
+        results, table_name = await db.run_in_transaction(_apply_operations, table_name, operations)
         
-        cursor.close()
+        await db.refresh_schema_cache()
         
         summary = f"✅ Successfully applied {len(operations)} schema operations to table '{table_name}':\n\n"
         summary += "\n".join(f"  {i+1}. {result}" for i, result in enumerate(results))
@@ -74,14 +48,117 @@ async def handle_edit_table_schema(args: Dict[str, Any]) -> str:
         return summary
         
     except Exception as e:
-        if cursor:
-            cursor.execute("ROLLBACK;")
-            cursor.close()
         return f"❌ Error modifying table schema: {str(e)}"
 
 
-async def _add_column(cursor, table_name: str, operation: Dict[str, Any]) -> None:
-    """Add a new column to the table"""
+def _apply_operations(cursor, table_name: str, operations: List[Dict[str, Any]]) -> Tuple[List[str], str]:
+    """Apply schema operations on one cursor, returning result lines and the final table name"""
+    results = []
+    
+    # Metadata rows for added columns are written in one batch; they are flushed
+    # before any operation that reads or rewrites column_metadata
+    pending_metadata = []
+    
+    for operation in operations:
+        action = operation.get("action")
+        
+        if action != "add_column":
+            _flush_column_metadata(cursor, pending_metadata)
+        
+        if action == "add_column":
+            added = _add_column(cursor, table_name, operation, pending_metadata)
+            if added:
+                results.append(f"✅ Added column '{operation.get('name')}'")
+            else:
+                results.append(f"ℹ️ Column '{operation.get('name')}' already exists - skipped")
+            
+        elif action == "remove_column":
+            _remove_column(cursor, table_name, operation)
+            results.append(f"✅ Removed column '{operation.get('name')}'")
+            
+        elif action == "rename_column":
+            _rename_column(cursor, table_name, operation)
+            results.append(f"✅ Renamed column '{operation.get('old_name')}' to '{operation.get('new_name')}'")
+            
+        elif action == "change_column_type":
+            _change_column_type(cursor, table_name, operation)
+            results.append(f"✅ Changed column '{operation.get('name')}' type to {operation.get('new_type')}")
+            
+        elif action == "rename_table":
+            new_name = operation.get("new_name")
+            cursor.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(
+                sql.Identifier(table_name), sql.Identifier(new_name)
+            ))
+            results.append(f"✅ Renamed table '{table_name}' to '{new_name}'")
+            table_name = new_name  # Update for subsequent operations
+    
+    _flush_column_metadata(cursor, pending_metadata)
+    
+    # Update metadata for schema changes
+    _update_table_metadata(cursor, table_name)
+    
+    return results, table_name
+
+
+def _flush_column_metadata(cursor, pending_metadata: List[tuple]) -> None:
+    """Write queued column metadata rows in one batch and clear the queue"""
+    if pending_metadata:
+        execute_values(cursor, COLUMN_METADATA_UPSERT_SQL, pending_metadata, page_size=100)
+        pending_metadata.clear()
+
+
+# Operation fields interpolated into DDL as identifiers / column types
+_IDENTIFIER_FIELDS = {
+    "add_column": ("name",),
+    "remove_column": ("name",),
+    "rename_column": ("old_name", "new_name"),
+    "change_column_type": ("name",),
+    "rename_table": ("new_name",),
+}
+_TYPE_FIELDS = {
+    "add_column": "type",
+    "change_column_type": "new_type",
+}
+
+
+def _validate_operation(operation: Dict[str, Any]) -> Optional[str]:
+    """Check identifiers and column types of one operation, normalizing them in place"""
+    action = operation.get("action")
+    if action not in _IDENTIFIER_FIELDS:
+        return f"Unknown operation '{action}'"
+    
+    for field in _IDENTIFIER_FIELDS[action]:
+        value = operation.get(field)
+        if value is not None:
+            name = normalize_identifier(value)
+            if not name:
+                return f"Invalid {field} '{value}' for {action}"
+            operation[field] = name
+    
+    type_field = _TYPE_FIELDS.get(action)
+    if type_field and operation.get(type_field) is not None:
+        data_type = normalize_data_type(operation[type_field])
+        if not data_type:
+            return f"Unsupported {type_field} '{operation[type_field]}' for {action}"
+        operation[type_field] = data_type
+    
+    return None
+
+
+def _table_columns(cursor, table_name: str) -> Optional[Set[str]]:
+    """Column names of a table from the cached schema snapshot, or None if the table doesn't exist
+    
+    The snapshot is read on the edit's own cursor, so columns changed earlier
+    in the same transaction are already reflected.
+    """
+    table = db.get_schema_with(cursor).get(table_name)
+    if table is None:
+        return None
+    return {col['column_name'] for col in table['columns']}
+
+
+def _add_column(cursor, table_name: str, operation: Dict[str, Any], pending_metadata: List[tuple]) -> bool:
+    """Add a new column to the table and queue its metadata, returning False if it already existed"""
     name = operation.get("name")
     data_type = operation.get("type", "TEXT")
     description = operation.get("description", "")
@@ -92,26 +169,34 @@ async def _add_column(cursor, table_name: str, operation: Dict[str, Any]) -> Non
     if not name:
         raise ValueError("Column name is required for add_column operation")
     
-    # Build ALTER TABLE statement
-    constraint = "NOT NULL" if required else ""
-    default_clause = f"DEFAULT {default_value}" if default_value else ""
-    
-    alter_sql = f"ALTER TABLE {table_name} ADD COLUMN {name} {data_type} {default_clause} {constraint};"
-    cursor.execute(alter_sql)
-    
-    # Store column metadata
-    metadata_sql = """
-    INSERT INTO _column_metadata (table_name, column_name, description, units, data_type)
-    VALUES (%s, %s, %s, %s, %s)
-    ON CONFLICT (table_name, column_name) DO UPDATE SET
-        description = EXCLUDED.description,
-        units = EXCLUDED.units,
-        data_type = EXCLUDED.data_type;
-    """
-    cursor.execute(metadata_sql, (table_name, name, description, units, data_type))
+    # Table and column existence come from the cached schema snapshot
+    columns = _table_columns(cursor, table_name)
+    if columns is None:
+        raise ValueError(f"Table '{table_name}' does not exist")
+    if name in columns:
+        return False
+    
+    template = _add_column_template(data_type, bool(default_value), bool(required))
+    cursor.execute(template.format(
+        table=sql.Identifier(table_name),
+        column=sql.Identifier(name),
+        default=sql.SQL(str(default_value)),  # a SQL expression, as before
+    ))
+    
+    # Queue column metadata for the batched write, in COLUMN_METADATA_UPSERT_SQL order
+    pending_metadata.append((table_name, name, description, data_type, units))
+    return True
 
 
-async def _remove_column(cursor, table_name: str, operation: Dict[str, Any]) -> None:
+@lru_cache(maxsize=64)
+def _add_column_template(data_type: str, has_default: bool, required: bool) -> sql.SQL:
+    """ALTER TABLE ... ADD COLUMN template for a column type and its default/NOT NULL clauses"""
+    default_clause = " DEFAULT {default}" if has_default else ""
+    constraint = " NOT NULL" if required else ""
+    return sql.SQL(f"ALTER TABLE {{table}} ADD COLUMN {{column}} {data_type}{default_clause}{constraint};")
+
+
+def _remove_column(cursor, table_name: str, operation: Dict[str, Any]) -> None:
     """Remove a column from the table"""
     name = operation.get("name")
     
@@ -119,23 +204,20 @@ async def _remove_column(cursor, table_name: str, operation: Dict[str, Any]) ->
         raise ValueError("Column name is required for remove_column operation")
     
     # Check if column exists
-    cursor.execute("""
-        SELECT column_name FROM information_schema.columns 
-        WHERE table_name = %s AND column_name = %s
-    """, (table_name, name))
-    
-    if not cursor.fetchone():
+    if name not in (_table_columns(cursor, table_name) or ()):
         raise ValueError(f"Column '{name}' does not exist in table '{table_name}'")
     
     # Remove column
-    cursor.execute(f"ALTER TABLE {table_name} DROP COLUMN {name};")
+    cursor.execute(sql.SQL("ALTER TABLE {} DROP COLUMN {}").format(
+        sql.Identifier(table_name), sql.Identifier(name)
+    ))
     
     # Remove metadata
-    cursor.execute("DELETE FROM _column_metadata WHERE table_name = %s AND column_name = %s", 
+    cursor.execute("DELETE FROM column_metadata WHERE table_name = %s AND column_name = %s", 
                    (table_name, name))
 
 
-async def _rename_column(cursor, table_name: str, operation: Dict[str, Any]) -> None:
+def _rename_column(cursor, table_name: str, operation: Dict[str, Any]) -> None:
     """Rename a column in the table"""
     old_name = operation.get("old_name")
     new_name = operation.get("new_name")
@@ -144,17 +226,19 @@ async def _rename_column(cursor, table_name: str, operation: Dict[str, Any]) ->
         raise ValueError("Both old_name and new_name are required for rename_column operation")
     
     # Rename column
-    cursor.execute(f"ALTER TABLE {table_name} RENAME COLUMN {old_name} TO {new_name};")
+    cursor.execute(sql.SQL("ALTER TABLE {} RENAME COLUMN {} TO {}").format(
+        sql.Identifier(table_name), sql.Identifier(old_name), sql.Identifier(new_name)
+    ))
     
     # Update metadata
     cursor.execute("""
-        UPDATE _column_metadata 
+        UPDATE column_metadata 
         SET column_name = %s 
         WHERE table_name = %s AND column_name = %s
     """, (new_name, table_name, old_name))
 
 
-async def _change_column_type(cursor, table_name: str, operation: Dict[str, Any]) -> None:
+def _change_column_type(cursor, table_name: str, operation: Dict[str, Any]) -> None:
     """Change the data type of a column"""
     name = operation.get("name")
     new_type = operation.get("new_type")
@@ -163,20 +247,23 @@ async def _change_column_type(cursor, table_name: str, operation: Dict[str, Any]
         raise ValueError("Both name and new_type are required for change_column_type operation")
     
     # Change column type
-    cursor.execute(f"ALTER TABLE {table_name} ALTER COLUMN {name} TYPE {new_type};")
+    # new_type was checked against ALLOWED_TYPES, so it is safe as raw SQL
+    cursor.execute(sql.SQL("ALTER TABLE {} ALTER COLUMN {} TYPE {}").format(
+        sql.Identifier(table_name), sql.Identifier(name), sql.SQL(new_type)
+    ))
     
     # Update metadata
     cursor.execute("""
-        UPDATE _column_metadata 
+        UPDATE column_metadata 
         SET data_type = %s 
         WHERE table_name = %s AND column_name = %s
     """, (new_type, table_name, name))
 
 
-async def _update_table_metadata(cursor, table_name: str) -> None:
+def _update_table_metadata(cursor, table_name: str) -> None:
     """Update table metadata after schema changes"""
     cursor.execute("""
-        UPDATE _table_metadata 
+        UPDATE table_metadata 
         SET updated_at = CURRENT_TIMESTAMP 
         WHERE table_name = %s
     """, (table_name,))
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""Validation for table/column names and column types interpolated into DDL"""
+
+import re
+from typing import Optional
+
+# Plain identifier, limited to the 63-byte NAMEDATALEN cap
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,62}$")
+
+# PostgreSQL reserved key words; as column names they need quoting in every
+# hand-written query (and unquoted `user` silently means current_user)
+RESERVED_WORDS = frozenset({
+    "all", "analyse", "analyze", "and", "any", "array", "as", "asc", "asymmetric",
+    "authorization", "binary", "both", "case", "cast", "check", "collate", "collation",
+    "column", "concurrently", "constraint", "create", "cross", "current_catalog",
+    "current_date", "current_role", "current_schema", "current_time", "current_timestamp",
+    "current_user", "default", "deferrable", "desc", "distinct", "do", "else", "end",
+    "except", "false", "fetch", "for", "foreign", "freeze", "from", "full", "grant",
+    "group", "having", "ilike", "in", "initially", "inner", "intersect", "into", "is",
+    "isnull", "join", "lateral", "leading", "left", "like", "limit", "localtime",
+    "localtimestamp", "natural", "not", "notnull", "null", "offset", "on", "only", "or",
+    "order", "outer", "overlaps", "placing", "primary", "references", "returning",
+    "right", "select", "session_user", "similar", "some", "symmetric", "system_user",
+    "table", "tablesample", "then", "to", "trailing", "true", "union", "unique", "user",
+    "using", "variadic", "verbose", "when", "where", "window", "with",
+})
+
+# Base type, an optional precision/length modifier and an optional time zone
+# clause, e.g. VARCHAR(50), NUMERIC(5,2), TIMESTAMP(3) WITH TIME ZONE; any
+# trailing [] array suffixes are split off first
+_TYPE = re.compile(r"^([A-Z][A-Z0-9 ]*?)\s*(\(\s*\d+\s*(?:,\s*\d+\s*)?\))?\s*(WITH(?:OUT)? TIME ZONE)?$")
+_ARRAY_SUFFIX = re.compile(r"(?:\s*\[\s*\])+$")
+
+ALLOWED_TYPES = frozenset({
+    "TEXT", "VARCHAR", "CHAR",
+    "INTEGER", "BIGINT", "SMALLINT", "SERIAL", "BIGSERIAL", "SMALLSERIAL",
+    "REAL", "DOUBLE PRECISION", "NUMERIC",
+    "BOOLEAN",
+    "DATE", "TIME", "TIMETZ", "TIMESTAMP", "TIMESTAMPTZ", "INTERVAL",
+    "JSON", "JSONB", "UUID",
+})
+
+# PostgreSQL aliases and the long names format_type() / information_schema
+# report (and list_tables / view_table show), mapped onto ALLOWED_TYPES
+TYPE_ALIASES = {
+    "INT": "INTEGER", "INT4": "INTEGER",
+    "INT8": "BIGINT",
+    "INT2": "SMALLINT",
+    "SERIAL4": "SERIAL", "SERIAL8": "BIGSERIAL", "SERIAL2": "SMALLSERIAL",
+    "FLOAT": "DOUBLE PRECISION", "FLOAT8": "DOUBLE PRECISION",
+    "FLOAT4": "REAL",
+    "DECIMAL": "NUMERIC", "DEC": "NUMERIC",
+    "BOOL": "BOOLEAN",
+    "CHARACTER VARYING": "VARCHAR", "CHAR VARYING": "VARCHAR",
+    "CHARACTER": "CHAR", "BPCHAR": "CHAR",
+    "TIMESTAMP WITHOUT TIME ZONE": "TIMESTAMP",
+    "TIMESTAMP WITH TIME ZONE": "TIMESTAMPTZ",
+    "TIME WITHOUT TIME ZONE": "TIME",
+    "TIME WITH TIME ZONE": "TIMETZ",
+}
+
+
+def normalize_identifier(name: Optional[str]) -> Optional[str]:
+    """Return the lower-cased table or column name if it is a plain, non-reserved identifier, otherwise None
+    
+    Names are always sql.Identifier-quoted in DDL, so folding case here keeps
+    them reachable from the unquoted SQL written against query_data.
+    """
+    if not isinstance(name, str) or _IDENT.match(name) is None:
+        return None
+    name = name.lower()
+    return None if name in RESERVED_WORDS else name
+
+
+def normalize_data_type(data_type: Optional[str]) -> Optional[str]:
+    """Return the canonical upper-cased column type if it is allowed, otherwise None
+    
+    Aliases such as INT4, FLOAT or CHARACTER VARYING(20) map to their
+    ALLOWED_TYPES name, keeping any modifier and array suffix.
+    """
+    if not isinstance(data_type, str):
+        return None
+    data_type = " ".join(data_type.upper().split())
+    array_suffix = _ARRAY_SUFFIX.search(data_type)
+    dimensions = array_suffix.group(0).count("[") if array_suffix else 0
+    if array_suffix:
+        data_type = data_type[:array_suffix.start()]
+    
+    match = _TYPE.match(data_type)
+    if not match:
+        return None
+    base, modifier, time_zone = match.groups()
+    if time_zone:
+        base = f"{base} {time_zone}"
+    if base == "FLOAT" and modifier:
+        # FLOAT(p) is REAL up to 24 bits of precision, DOUBLE PRECISION above
+        precision = modifier.strip("() ")
+        if not precision.isdigit():
+            return None
+        base = "REAL" if int(precision) <= 24 else "DOUBLE PRECISION"
+        modifier = None
+    base = TYPE_ALIASES.get(base, base)
+    if base not in ALLOWED_TYPES:
+        return None
+    return base + (modifier or "").replace(" ", "") + "[]" * dimensions
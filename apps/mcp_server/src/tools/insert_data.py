@@ -1,8 +1,15 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
 from mcp import Tool
+from psycopg2 import sql
+from psycopg2.extras import execute_values
 from ..database import db
-from .table_metadata import update_ai_learning
 import json
 
+# Largest single-row payload (in JSON characters) echoed back after an insert
+INSERT_ECHO_LIMIT = 1024
+
 INSERT_DATA_TOOL = Tool(
     name="insert_data",
     description="Insert row into table with auto-timestamp",
@@ -16,9 +23,14 @@ INSERT_DATA_TOOL = Tool(
             "data": {
                 "type": "object",
                 "description": "Key-value pairs of column names and values"
+            },
+            "rows": {
+                "type": "array",
+                "items": {"type": "object"},
+                "description": "Several rows to insert in one batch (instead of data)"
             }
         },
-        "required": ["table_name", "data"]
+        "required": ["table_name"]
     }
 )
 
@@ -59,62 +71,80 @@ async def handle_insert_data(arguments: dict) -> str:
     """
     try:
         table_name = arguments['table_name']
-        data = arguments['data']
+        rows = arguments.get('rows') or [arguments['data']]
+        
+        # Schema check and INSERT share one pooled connection and transaction
+        error, filtered_rows, new_ids = await db.run_in_transaction(_insert_rows, table_name, rows)
+        if error:
+            return error
+        
+        # Insertion patterns aren't recorded as AI learnings yet: update_ai_learning
+        # is a no-op stub until table_metadata gains an ai_learnings write
+        
+        if len(filtered_rows) > 1:
+            return f"✅ Inserted {len(filtered_rows)} rows into '{table_name}' (IDs: {', '.join(str(i) for i in new_ids)})"
+        
+        filtered_data = filtered_rows[0]
         
-        # Check if table exists
-        table_check = db.execute_query(
-            "SELECT table_name FROM information_schema.tables WHERE table_name = %s",
-            (table_name,)
-        )
-        if not table_check:
-            return f"❌ Table '{table_name}' does not exist"
+        # Only echo rows small enough to read back; the compact C-encoded size decides
+        if len(json.dumps(filtered_data, default=str)) > INSERT_ECHO_LIMIT:
+            return f"✅ Inserted {len(filtered_data)} fields into '{table_name}' (ID: {new_ids[0]})"
         
-        # Get table columns to validate data
-        columns_info = db.execute_query(
-            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s",
-            (table_name,)
-        )
-        valid_columns = {col['column_name']: col['data_type'] for col in columns_info}
+        return f"✅ Inserted data into '{table_name}' (ID: {new_ids[0]})\nData: {json.dumps(filtered_data, default=str, indent=2)}"
         
-        # Filter data to only include valid columns (excluding auto-generated ones)
+    except Exception as e:
+        return f"❌ Error inserting data: {str(e)}"
+
+
+def _insert_rows(cursor, table_name: str, rows: List[Dict[str, Any]]) -> Tuple[Optional[str], List[Dict[str, Any]], List[Any]]:
+    """Validate rows against the cached schema snapshot and insert them, returning (error, rows, ids)"""
+    # Table existence and column types come from the cached schema snapshot
+    table = db.get_schema_with(cursor).get(table_name)
+    if not table:
+        return f"❌ Table '{table_name}' does not exist", [], []
+    
+    valid_columns = {col['column_name']: col['data_type'] for col in table['columns']}
+    
+    # Filter data to only include valid columns (excluding auto-generated ones)
+    filtered_rows = []
+    for data in rows:
         filtered_data = {}
         for key, value in data.items():
             if key in valid_columns and key not in ['id', 'created_at']:
                 filtered_data[key] = value
             elif key not in valid_columns:
-                return f"❌ Column '{key}' does not exist in table '{table_name}'"
+                return f"❌ Column '{key}' does not exist in table '{table_name}'", [], []
         
         if not filtered_data:
-            return f"❌ No valid data provided for table '{table_name}'"
-        
-        # Build INSERT statement
-        columns = list(filtered_data.keys())
-        placeholders = ', '.join(['%s'] * len(columns))
-        values = list(filtered_data.values())
-        
-        insert_sql = f"""
-        INSERT INTO {table_name} ({', '.join(columns)}) 
-        VALUES ({placeholders})
-        RETURNING id
-        """
-        
-        # Execute insert
-        result = db.execute_query(insert_sql, values)
-        if not result:
-            return f"❌ Error inserting data into table '{table_name}'"
-        
-        new_id = result[0]['id'] if result else None
-        
-        # Update AI learnings with insertion patterns
-        data_patterns = {
-            "recent_data_types": {k: str(type(v).__name__) for k, v in filtered_data.items()},
-            "recent_columns_used": list(filtered_data.keys()),
-            "last_insertion": str(filtered_data)
-        }
-        
-        update_ai_learning(table_name, "insertion_patterns", data_patterns)
-        
-        return f"✅ Inserted data into '{table_name}' (ID: {new_id})\nData: {json.dumps(filtered_data, default=str, indent=2)}"
+            return f"❌ No valid data provided for table '{table_name}'", [], []
+        filtered_rows.append(filtered_data)
+    
+    # Rows sharing a column set go out as one multi-row INSERT, so omitted
+    # columns still get their defaults; sorting the key means key order in
+    # the input doesn't split batches or the cached statements
+    batches: Dict[Tuple[str, ...], List[int]] = {}
+    for i, filtered_data in enumerate(filtered_rows):
+        batches.setdefault(tuple(sorted(filtered_data)), []).append(i)
+    
+    new_ids = [None] * len(filtered_rows)
+    for columns, indexes in batches.items():
+        insert_sql = _insert_template(table_name, columns)
+        values = [tuple(filtered_rows[i][c] for c in columns) for i in indexes]
         
-    except Exception as e:
-        return f"❌ Error inserting data: {str(e)}"
\ No newline at end of file
+        result = execute_values(cursor, insert_sql, values, page_size=1000, fetch=True)
+        if len(result) != len(indexes):
+            # Earlier batches may already be in; raising rolls the whole insert back
+            raise RuntimeError(f"expected {len(indexes)} rows inserted into '{table_name}', got {len(result)}")
+        for i, row in zip(indexes, result):
+            new_ids[i] = row['id']
+    
+    return None, filtered_rows, new_ids
+
+
+@lru_cache(maxsize=512)
+def _insert_template(table_name: str, columns: Tuple[str, ...]) -> sql.Composed:
+    """INSERT ... VALUES %s RETURNING id for one table and column order, built once per shape"""
+    return sql.SQL("INSERT INTO {} ({}) VALUES %s RETURNING id").format(
+        sql.Identifier(table_name),
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+    )
@@ -1,6 +1,9 @@
+from typing import Any, Dict, List, Optional, Tuple
+
 from mcp import Tool
+from psycopg2 import sql
 from ..database import db
-from .table_metadata import get_metadata, get_all_metadata, format_ai_learnings, format_usage_patterns
+from .table_metadata import format_ai_learnings, format_usage_patterns
 
 LIST_TABLES_TOOL = Tool(
     name="list_tables",
@@ -47,81 +50,82 @@ async def handle_list_tables(arguments: dict) -> str:
         table_name = arguments.get('table_name')
         
         if table_name:
-            # Get detailed info for specific table
-            table_info = db.get_table_info(table_name)
-            if not table_info:
+            # Snapshot lookup and recent rows share one pooled transaction
+            info, sample_data = await db.run_in_transaction(_table_detail, table_name)
+            if not info:
                 return f"Table '{table_name}' not found"
             
-            info = table_info[0]
-            response = f"## Table: {info['table_name']}\n"
-            response += f"**Description**: {info['description']}\n"
-            response += f"**Purpose**: {info['purpose']}\n\n"
+            parts = [f"## Table: {info['table_name']}\n"]
+            parts.append(f"**Description**: {info['description']}\n")
+            parts.append(f"**Purpose**: {info['purpose']}\n\n")
             
-            # Get AI metadata
-            metadata = get_metadata(table_name)
-            if metadata:
-                if metadata['ai_learnings']:
-                    response += "**🧠 AI Learnings**:\n"
-                    response += format_ai_learnings(metadata['ai_learnings']) + "\n\n"
-                
-                if metadata['usage_patterns']:
-                    response += "**📊 Usage Patterns**:\n"
-                    response += format_usage_patterns(metadata['usage_patterns']) + "\n\n"
-                
-                if metadata['data_quality_notes']:
-                    response += f"**💡 Data Quality Notes**: {metadata['data_quality_notes']}\n\n"
+            # AI metadata rides along in the snapshot row
+            if info['ai_learnings']:
+                parts.append("**🧠 AI Learnings**:\n")
+                parts.append(format_ai_learnings(info['ai_learnings']) + "\n\n")
+            
+            if info['usage_patterns']:
+                parts.append("**📊 Usage Patterns**:\n")
+                parts.append(format_usage_patterns(info['usage_patterns']) + "\n\n")
+            
+            if info['data_quality_notes']:
+                parts.append(f"**💡 Data Quality Notes**: {info['data_quality_notes']}\n\n")
             
-            response += "**Columns**:\n"
+            parts.append("**Columns**:\n")
             for col in info['columns']:
-                response += f"- `{col['column_name']}` ({col['data_type']})"
+                parts.append(f"- `{col['column_name']}` ({col['data_type']})")
                 if col['description']:
-                    response += f": {col['description']}"
+                    parts.append(f": {col['description']}")
                 if col['units']:
-                    response += f" [{col['units']}]"
-                response += "\n"
-            
-            # Get sample data
-            sample_query = f"SELECT * FROM {table_name} ORDER BY created_at DESC LIMIT 3"
-            sample_data = db.execute_query(sample_query)
+                    parts.append(f" [{col['units']}]")
+                parts.append("\n")
             
             if sample_data:
-                response += f"\n**Recent Data ({len(sample_data)} entries)**:\n"
+                parts.append(f"\n**Recent Data ({len(sample_data)} entries)**:\n")
                 for row in sample_data:
-                    response += f"- {row['date']}: {dict(row)}\n"
+                    parts.append(f"- {row['date']}: {dict(row)}\n")
             
-            return response
+            return "".join(parts)
         
         else:
-            # Get overview of all tables
-            tables = db.get_table_info()
-            all_metadata = get_all_metadata()
-            
-            # Create metadata lookup
-            metadata_lookup = {m['table_name']: m for m in all_metadata}
+            # Tables, metadata and columns all come from one snapshot query
+            schema = await db.fetch_schema()
             
-            response = "## Available Tables\n\n"
-            for table in tables:
-                table_name = table['table_name']
-                response += f"### {table_name}\n"
-                response += f"- **Description**: {table['description']}\n"
-                response += f"- **Purpose**: {table['purpose']}\n"
-                response += f"- **Columns**: {table['column_count']}\n"
+            parts = ["## Available Tables\n\n"]
+            for table_name, table in schema.items():
+                if not table['has_metadata'] or not table['columns']:
+                    continue
+                parts.append(f"### {table_name}\n")
+                parts.append(f"- **Description**: {table['description']}\n")
+                parts.append(f"- **Purpose**: {table['purpose']}\n")
+                parts.append(f"- **Columns**: {len(table['columns'])}\n")
                 
                 # Add AI learnings summary if available
-                if table_name in metadata_lookup:
-                    metadata = metadata_lookup[table_name]
-                    if metadata['ai_learnings']:
-                        key_learnings = list(metadata['ai_learnings'].keys())[:3]  # Show first 3 keys
-                        response += f"- **AI Insights**: {', '.join(key_learnings)}"
-                        if len(metadata['ai_learnings']) > 3:
-                            response += f" (+{len(metadata['ai_learnings']) - 3} more)"
-                        response += "\n"
+                if table['ai_learnings']:
+                    key_learnings = list(table['ai_learnings'].keys())[:3]  # Show first 3 keys
+                    parts.append(f"- **AI Insights**: {', '.join(key_learnings)}")
+                    if len(table['ai_learnings']) > 3:
+                        parts.append(f" (+{len(table['ai_learnings']) - 3} more)")
+                    parts.append("\n")
                 
-                response += "\n"
+                parts.append("\n")
             
-            response += "\n*Use `list_tables` with a specific table_name for detailed schema and AI learnings.*"
+            parts.append("\n*Use `list_tables` with a specific table_name for detailed schema and AI learnings.*")
             
-            return response
+            return "".join(parts)
             
     except Exception as e:
-        return f"Error listing tables: {str(e)}"
\ No newline at end of file
+        return f"Error listing tables: {str(e)}"
+
+
+def _table_detail(cursor, table_name: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Snapshot row and the three most recent rows of a table, or (None, []) if it isn't listed"""
+    # Single dict lookup in the cached snapshot, no catalog scan
+    info = db.get_schema_with(cursor).get(table_name)
+    if not info or not info['has_metadata'] or not info['columns']:
+        return None, []
+    
+    cursor.execute(sql.SQL("SELECT * FROM {} ORDER BY created_at DESC LIMIT 3").format(
+        sql.Identifier(table_name)
+    ))
+    return info, [dict(row) for row in cursor.fetchall()]
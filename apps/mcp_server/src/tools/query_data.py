@@ -1,6 +1,20 @@
 from mcp import Tool
 from ..database import db
+import asyncio
+import itertools
 import json
+import re
+from contextlib import closing
+
+# Basic SQL injection protection (enhance for production): whole-word match so
+# identifiers like updated_at or dropbox_id don't trip it
+DANGEROUS_KEYWORDS = re.compile(r'\b(?:DROP|DELETE|TRUNCATE|ALTER|INSERT|UPDATE)\b', re.IGNORECASE)
+
+# Rows rendered into a markdown table before the output is cut off
+TABLE_ROW_LIMIT = 10000
+
+# Shared encoder for the json format; dates, decimals and UUIDs fall back to str
+ROW_ENCODER = json.JSONEncoder(default=str)
 
 QUERY_DATA_TOOL = Tool(
     name="query_data",
@@ -67,52 +81,68 @@ async def handle_query_data(arguments: dict) -> str:
         sql = arguments['sql']
         format_type = arguments.get('format', 'table')
         
-        # Basic SQL injection protection (enhance for production)
-        dangerous_keywords = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'INSERT', 'UPDATE']
-        sql_upper = sql.upper()
-        for keyword in dangerous_keywords:
-            if keyword in sql_upper:
-                return f"❌ {keyword} operations are not allowed"
+        dangerous = DANGEROUS_KEYWORDS.search(sql)
+        if dangerous:
+            return f"❌ {dangerous.group(0).upper()} operations are not allowed"
         
-        # Execute query
-        results = db.execute_query(sql)
+        return await asyncio.to_thread(_render_results, sql, format_type)
         
-        if not results:
+    except Exception as e:
+        return f"❌ Error executing query: {str(e)}"
+
+def _render_results(sql: str, format_type: str) -> str:
+    """Stream the query from a server-side cursor and format it (runs in a worker thread)"""
+    with closing(db.stream_query(sql)) as rows:
+        first = next(rows, None)
+        if first is None:
             return "No results found."
         
         if format_type == "json":
-            return json.dumps(results, default=str, indent=2)
+            # One compact object per line: the C encoder only runs without indent
+            encoded = map(ROW_ENCODER.encode, itertools.chain((first,), rows))
+            return "[\n  " + ",\n  ".join(encoded) + "\n]"
         
-        elif format_type == "summary":
-            response = f"## Query Results\n\n"
-            response += f"**Rows returned**: {len(results)}\n"
-            response += f"**Columns**: {', '.join(results[0].keys())}\n\n"
-            
-            # Show first few rows
-            for i, row in enumerate(results[:5]):
-                response += f"**Row {i+1}**: {dict(row)}\n"
+        headers = list(first.keys())
+        
+        if format_type == "summary":
+            parts = [
+                f"## Query Results\n\n",
+                None,  # row count, filled in once the stream is drained
+                f"**Columns**: {', '.join(headers)}\n\n",
+                f"**Row 1**: {dict(first)}\n",
+            ]
+            count = 1
+            for row in rows:
+                count += 1
+                # Show first few rows
+                if count <= 5:
+                    parts.append(f"**Row {count}**: {dict(row)}\n")
+            parts[1] = f"**Rows returned**: {count}\n"
             
-            if len(results) > 5:
-                response += f"\n... and {len(results) - 5} more rows"
+            if count > 5:
+                parts.append(f"\n... and {count - 5} more rows")
             
-            return response
+            return "".join(parts)
         
         else:  # table format
-            if not results:
-                return "No data found."
-            
             # Create markdown table
-            headers = list(results[0].keys())
-            response = "| " + " | ".join(headers) + " |\n"
-            response += "|" + "|".join([" --- "] * len(headers)) + "|\n"
-            
-            for row in results:
+            parts = [
+                "| " + " | ".join(headers) + " |\n",
+                "|" + "|".join([" --- "] * len(headers)) + "|\n",
+            ]
+            count = 0
+            truncated = False
+            for row in itertools.chain((first,), rows):
+                if count == TABLE_ROW_LIMIT:
+                    truncated = True
+                    break
                 values = [str(row[header]) if row[header] is not None else "" for header in headers]
-                response += "| " + " | ".join(values) + " |\n"
+                parts.append("| " + " | ".join(values) + " |\n")
+                count += 1
             
-            response += f"\n*{len(results)} rows returned*"
+            if truncated:
+                parts.append(f"\n*First {count} rows shown; add a LIMIT or aggregate to see the rest*")
+            else:
+                parts.append(f"\n*{count} rows returned*")
             
-            return response
-        
-    except Exception as e:
-        return f"❌ Error executing query: {str(e)}"
\ No newline at end of file
+            return "".join(parts)
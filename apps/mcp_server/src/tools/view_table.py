@@ -1,8 +1,79 @@
 """View table tool - inspect table data with schema and sample rows"""
 
-from typing import Dict, Any, List, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from psycopg2 import sql
+from psycopg2.extensions import cursor as TupleCursor
 from ..database import db
 
+# Existence, columns, nullability, defaults, the planner's row estimate and
+# (when present) table/column metadata of one table in a single pg_catalog
+# query; no rows means the table doesn't exist
+TABLE_DETAIL_QUERY = """
+    SELECT a.attname, format_type(a.atttypid, a.atttypmod), NOT a.attnotnull,
+           pg_get_expr(d.adbin, d.adrelid), c.reltuples::bigint,
+           {metadata_columns}
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    {metadata_joins}
+    WHERE n.nspname = 'public'
+    AND c.relname = %s
+    AND c.relkind IN ('r', 'p')
+    ORDER BY a.attnum
+"""
+
+TABLE_DETAIL_WITH_METADATA = TABLE_DETAIL_QUERY.format(
+    metadata_columns="cm.description, cm.units, tm.table_name IS NOT NULL, tm.description, tm.purpose, tm.created_at, tm.updated_at",
+    metadata_joins="""LEFT JOIN _table_metadata tm ON tm.table_name = c.relname
+    LEFT JOIN _column_metadata cm ON cm.table_name = c.relname AND cm.column_name = a.attname""",
+)
+
+TABLE_DETAIL_WITHOUT_METADATA = TABLE_DETAIL_QUERY.format(
+    metadata_columns="NULL, NULL, false, NULL, NULL, NULL, NULL",
+    metadata_joins="",
+)
+
+# Whether _table_metadata and _column_metadata exist, checked once per process
+_metadata_tables_exist = None
+
+# Tables estimated below this many rows get an exact COUNT(*)
+EXACT_COUNT_LIMIT = 100_000
+
+# Row count and sample statements; {table} is the table identifier and
+# %(limit)s the number of rows to sample from each end
+ROW_QUERIES = {
+    "count": "SELECT COUNT(*) FROM {table}",
+    # First rows only, tagged like the combined queries below; for tables
+    # small enough that the first rows already cover every row
+    "newest": "SELECT 1, 0, * FROM {table} ORDER BY created_at DESC LIMIT %(limit)s",
+    "head": "SELECT 1, 0, * FROM {table} LIMIT %(limit)s",
+    # Newest and oldest rows in one round trip: every row is tagged with its
+    # bucket (1 first, 2 last) and position, which are stripped client-side
+    "newest_oldest": """
+        SELECT 1, row_number() OVER (), t.* FROM (
+            SELECT * FROM {table} ORDER BY created_at DESC LIMIT %(limit)s
+        ) t
+        UNION ALL
+        SELECT 2, row_number() OVER (), t.* FROM (
+            SELECT * FROM {table} ORDER BY created_at ASC LIMIT %(limit)s
+        ) t
+        ORDER BY 1, 2
+    """,
+    # Without created_at the last rows come from reversing the physical order
+    "head_tail": """
+        SELECT 1, row_number() OVER (), t.* FROM (
+            SELECT * FROM {table} LIMIT %(limit)s
+        ) t
+        UNION ALL
+        SELECT 2, -row_number() OVER (), t.* FROM (
+            SELECT * FROM {table} ORDER BY CTID DESC LIMIT %(limit)s
+        ) t
+        ORDER BY 1, 2
+    """,
+}
+
 
 async def handle_view_table(args: Dict[str, Any]) -> str:
     """
@@ -21,185 +92,144 @@ async def handle_view_table(args: Dict[str, Any]) -> str:
     if not table_name:
         return "❌ Error: table_name is required"
     
-    if not db.conn:
-        return "❌ Error: Database not connected"
-    
-    cursor = None
     try:
-        cursor = db.conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_name = %s
-            )
-        """, (table_name,))
-        
-        if not cursor.fetchone()[0]:
-            cursor.close()
+        # Every probe and sample read shares one pooled connection and transaction
+        view = await db.run_in_transaction(_collect_table_view, table_name, limit)
+        if view is None:
             return f"❌ Error: Table '{table_name}' does not exist"
         
-        # Get table metadata
-        table_info = await _get_table_info(cursor, table_name)
-        
-        # Get column schema
-        columns = await _get_column_schema(cursor, table_name)
-        
-        # Get row count
-        row_count = await _get_row_count(cursor, table_name)
-        
-        # Get sample data
-        first_rows = await _get_first_rows(cursor, table_name, limit)
-        last_rows = await _get_last_rows(cursor, table_name, limit)
-        
-        cursor.close()
+        table_info, columns, row_count, row_count_estimated, first_rows, last_rows = view
         
         # Format as markdown
-        markdown = _format_table_view(table_name, table_info, columns, row_count, first_rows, last_rows, limit)
+        markdown = _format_table_view(table_name, table_info, columns, row_count, first_rows, last_rows, limit,
+                                      row_count_estimated)
         
         return markdown
         
     except Exception as e:
-        if cursor:
-            cursor.close()
         return f"❌ Error viewing table '{table_name}': {str(e)} (Type: {type(e).__name__})"
 
 
-async def _get_table_info(cursor, table_name: str) -> Dict[str, Any]:
-    """Get table metadata"""
-    try:
-        cursor.execute("""
-            SELECT description, purpose, created_at, updated_at
-            FROM _table_metadata 
-            WHERE table_name = %s
-        """, (table_name,))
+def _collect_table_view(pooled_cursor, table_name: str, limit: int) -> Optional[Tuple]:
+    """Read everything view_table shows, or None if the table doesn't exist (runs in a worker thread)"""
+    # The helpers below index rows by position
+    with pooled_cursor.connection.cursor(cursor_factory=TupleCursor) as cursor:
+        # Get table metadata and column schema; no columns means the table doesn't exist
+        table_info, columns = _load_all_metadata(cursor, table_name)
+        if not columns:
+            return None
+        
+        has_created_at = any(col["name"] == "created_at" for col in columns)
+        
+        # Get row count
+        row_count, row_count_estimated = _get_row_count(cursor, table_name, table_info["estimated_rows"])
         
-        result = cursor.fetchone()
-        if result:
-            return {
-                "description": result[0],
-                "purpose": result[1], 
-                "created_at": result[2],
-                "updated_at": result[3]
-            }
-    except Exception:
-        # Metadata table might not exist, return empty info
-        pass
+        # Get sample data
+        # Oldest entries are only shown when they differ from the first rows
+        first_rows, last_rows = _get_sample_rows(cursor, table_name, limit, has_created_at,
+                                                 include_last=row_count > limit)
+        
+        return table_info, columns, row_count, row_count_estimated, first_rows, last_rows
+
+
+def _load_all_metadata(cursor, table_name: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Get table metadata and column information with metadata in one round trip"""
+    global _metadata_tables_exist
+    if _metadata_tables_exist is None:
+        # Metadata tables might not exist; then the schema is shown without them
+        cursor.execute("""
+            SELECT to_regclass('public._table_metadata') IS NOT NULL
+               AND to_regclass('public._column_metadata') IS NOT NULL
+        """)
+        _metadata_tables_exist = cursor.fetchone()[0]
     
-    return {"description": "", "purpose": "", "created_at": None, "updated_at": None}
-
-
-async def _get_column_schema(cursor, table_name: str) -> List[Dict[str, Any]]:
-    """Get column information with metadata"""
-    # Get basic column info from information_schema
-    cursor.execute("""
-        SELECT column_name, data_type, is_nullable, column_default
-        FROM information_schema.columns
-        WHERE table_name = %s
-        ORDER BY ordinal_position
-    """, (table_name,))
+    query = TABLE_DETAIL_WITH_METADATA if _metadata_tables_exist else TABLE_DETAIL_WITHOUT_METADATA
+    cursor.execute(query, (table_name,))
+    rows = cursor.fetchall()
     
-    columns_basic = cursor.fetchall()
-    
-    # Get metadata for columns
-    metadata = {}
-    try:
-        cursor.execute("""
-            SELECT column_name, description, units
-            FROM _column_metadata
-            WHERE table_name = %s
-        """, (table_name,))
-        
-        metadata = {row[0]: {"description": row[1], "units": row[2]} for row in cursor.fetchall()}
-    except Exception:
-        # Metadata table might not exist, continue without metadata
-        pass
+    table_info = {"description": "", "purpose": "", "created_at": None, "updated_at": None}
+    if rows and rows[0][7]:
+        table_info = {
+            "description": rows[0][8],
+            "purpose": rows[0][9],
+            "created_at": rows[0][10],
+            "updated_at": rows[0][11]
+        }
+    table_info["estimated_rows"] = rows[0][4] if rows else None
     
     columns = []
-    for col in columns_basic:
-        name, data_type, is_nullable, default = col
-        meta = metadata.get(name, {})
-        
+    for name, data_type, nullable, default, _, description, units, *_ in rows:
         columns.append({
             "name": name,
             "type": data_type,
-            "nullable": is_nullable == "YES",
+            "nullable": nullable,
             "default": default,
-            "description": meta.get("description", ""),
-            "units": meta.get("units", "")
+            "description": description or "",
+            "units": units or ""
         })
     
-    return columns
+    return table_info, columns
 
 
-async def _get_row_count(cursor, table_name: str) -> int:
-    """Get total number of rows in table"""
-    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-    return cursor.fetchone()[0]
+def _get_row_count(cursor, table_name: str, estimated_rows: Optional[int]) -> Tuple[int, bool]:
+    """Get total number of rows in table, returning (count, is_estimate)"""
+    # Large tables show the planner's estimate instead of paying for a full
+    # scan; small or never-analyzed tables (reltuples -1) are counted exactly
+    if estimated_rows is not None and estimated_rows >= EXACT_COUNT_LIMIT:
+        return estimated_rows, True
+    
+    cursor.execute(_row_query(table_name, "count"))
+    return cursor.fetchone()[0], False
 
 
-async def _get_first_rows(cursor, table_name: str, limit: int) -> List[Tuple]:
-    """Get first few rows (most recent by created_at if available)"""
-    # Check if created_at column exists
-    cursor.execute("""
-        SELECT column_name FROM information_schema.columns
-        WHERE table_name = %s AND column_name = 'created_at'
-    """, (table_name,))
-    
-    has_created_at = cursor.fetchone() is not None
-    
-    if has_created_at:
-        cursor.execute(f"SELECT * FROM {table_name} ORDER BY created_at DESC LIMIT %s", (limit,))
-    else:
-        cursor.execute(f"SELECT * FROM {table_name} LIMIT %s", (limit,))
-    
-    return cursor.fetchall()
+@lru_cache(maxsize=128)
+def _row_query(table_name: str, kind: str) -> sql.Composed:
+    """One of ROW_QUERIES composed for a table, with the name quoted as an identifier"""
+    return sql.SQL(ROW_QUERIES[kind]).format(table=sql.Identifier(table_name))
 
 
-async def _get_last_rows(cursor, table_name: str, limit: int) -> List[Tuple]:
-    """Get last few rows (oldest by created_at if available)"""
-    # Check if created_at column exists
-    cursor.execute("""
-        SELECT column_name FROM information_schema.columns
-        WHERE table_name = %s AND column_name = 'created_at'
-    """, (table_name,))
-    
-    has_created_at = cursor.fetchone() is not None
+def _get_sample_rows(cursor, table_name: str, limit: int, has_created_at: bool,
+                     include_last: bool = True) -> Tuple[List[Tuple], List[Tuple]]:
+    """Get the first and last few rows (newest and oldest by created_at if available)
     
-    if has_created_at:
-        cursor.execute(f"SELECT * FROM {table_name} ORDER BY created_at ASC LIMIT %s", (limit,))
+    Sample rows can be wide and limit is caller-controlled, so they are streamed
+    from a server-side cursor in itersize batches instead of one fetchall().
+    """
+    if include_last:
+        kind = "newest_oldest" if has_created_at else "head_tail"
     else:
-        # If no created_at, get last rows by reversing the order
-        cursor.execute(f"""
-            SELECT * FROM (
-                SELECT * FROM {table_name} ORDER BY CTID DESC LIMIT %s
-            ) sub ORDER BY CTID ASC
-        """, (limit,))
+        kind = "newest" if has_created_at else "head"
+    query = _row_query(table_name, kind)
+    first_rows, last_rows = [], []
+    with cursor.connection.cursor(name="view_table_sample", cursor_factory=TupleCursor) as sample_cursor:
+        sample_cursor.itersize = max(1, min(2 * limit, 1000))
+        sample_cursor.execute(query, {"limit": limit})
+        for bucket, _, *row in sample_cursor:
+            (first_rows if bucket == 1 else last_rows).append(tuple(row))
     
-    return cursor.fetchall()
+    return first_rows, last_rows
 
 
 def _format_table_view(table_name: str, table_info: Dict, columns: List[Dict], 
                       row_count: int, first_rows: List[Tuple], last_rows: List[Tuple], 
-                      limit: int) -> str:
+                      limit: int, row_count_estimated: bool = False) -> str:
     """Format table view as markdown"""
     
     # Header
-    md = f"# 📊 Table: `{table_name}`\n\n"
+    parts = [f"# 📊 Table: `{table_name}`\n\n"]
     
     # Table info
     if table_info.get("description"):
-        md += f"**Description:** {table_info['description']}\n\n"
+        parts.append(f"**Description:** {table_info['description']}\n\n")
     if table_info.get("purpose"):
-        md += f"**Purpose:** {table_info['purpose']}\n\n"
+        parts.append(f"**Purpose:** {table_info['purpose']}\n\n")
     
-    md += f"**Total rows:** {row_count:,}\n\n"
+    parts.append(f"**Total rows:** {'~' if row_count_estimated else ''}{row_count:,}\n\n")
     
     # Schema section
-    md += "## 📋 Schema\n\n"
-    md += "| Column | Type | Description | Units | Nullable | Default |\n"
-    md += "|--------|------|-------------|-------|----------|----------|\n"
+    parts.append("## 📋 Schema\n\n")
+    parts.append("| Column | Type | Description | Units | Nullable | Default |\n")
+    parts.append("|--------|------|-------------|-------|----------|----------|\n")
     
     for col in columns:
         units = f"`{col['units']}`" if col['units'] else ""
@@ -207,56 +237,88 @@ def _format_table_view(table_name: str, table_info: Dict, columns: List[Dict],
         default = f"`{col['default']}`" if col['default'] else ""
         description = col['description'] or "_No description_"
         
-        md += f"| `{col['name']}` | `{col['type']}` | {description} | {units} | {nullable} | {default} |\n"
+        parts.append(f"| `{col['name']}` | `{col['type']}` | {description} | {units} | {nullable} | {default} |\n")
     
-    md += "\n"
+    parts.append("\n")
     
     # Data sections
     if row_count > 0:
-        # Get column names for headers
-        col_names = [col['name'] for col in columns]
+        # Header rows and per-column cell formatters are shared by both data tables
+        header = _data_table_header([col['name'] for col in columns])
+        formatters = [_cell_formatter(col['type']) for col in columns]
         
         # Recent data
         if first_rows:
-            md += f"## 🔄 Most Recent Entries (Top {min(limit, len(first_rows))})\n\n"
-            md += _format_data_table(col_names, first_rows)
-            md += "\n"
+            parts.append(f"## 🔄 Most Recent Entries (Top {min(limit, len(first_rows))})\n\n")
+            parts.append(_format_data_table(header, formatters, first_rows))
+            parts.append("\n")
         
         # Oldest data (only show if different from recent and we have enough rows)
         if last_rows and row_count > limit and last_rows != first_rows:
-            md += f"## 📅 Oldest Entries (First {min(limit, len(last_rows))})\n\n"
-            md += _format_data_table(col_names, last_rows)
-            md += "\n"
+            parts.append(f"## 📅 Oldest Entries (First {min(limit, len(last_rows))})\n\n")
+            parts.append(_format_data_table(header, formatters, last_rows))
+            parts.append("\n")
     else:
-        md += "## 📭 No Data\n\nThis table is empty.\n\n"
+        parts.append("## 📭 No Data\n\nThis table is empty.\n\n")
     
     # Footer with usage tips
-    md += "---\n"
-    md += f"💡 **Tips:** Use `query_data` for complex analysis or `insert_data` to add new {table_name} entries.\n"
+    parts.append("---\n")
+    parts.append(f"💡 **Tips:** Use `query_data` for complex analysis or `insert_data` to add new {table_name} entries.\n")
     
-    return md
+    return "".join(parts)
+
+
+def _data_table_header(col_names: List[str]) -> str:
+    """Markdown header and separator rows for a data table"""
+    return "| " + " | ".join(col_names) + " |\n" + "| " + " | ".join(["---"] * len(col_names)) + " |\n"
 
 
-def _format_data_table(col_names: List[str], rows: List[Tuple]) -> str:
+def _format_text_cell(val: Any) -> str:
+    if val is None:
+        return "_null_"
+    return f"{val[:47]}..." if len(val) > 50 else val
+
+
+def _format_plain_cell(val: Any) -> str:
+    return "_null_" if val is None else str(val)
+
+
+def _format_any_cell(val: Any) -> str:
+    if val is None:
+        return "_null_"
+    if isinstance(val, str) and len(val) > 50:
+        return f"{val[:47]}..."
+    return str(val)
+
+
+# format_type() prefixes whose values come back as str / as numbers, dates or booleans
+TEXT_TYPE_PREFIXES = ("text", "character", "citext")
+PLAIN_TYPE_PREFIXES = ("integer", "bigint", "smallint", "real", "double precision", "numeric",
+                       "boolean", "date", "time", "timestamp", "interval", "uuid")
+
+
+def _cell_formatter(data_type: str) -> Callable[[Any], str]:
+    """Pick the cell formatter for a column type, checked once per column instead of per cell"""
+    if data_type.endswith("[]"):
+        # Arrays are decoded to lists
+        return _format_any_cell
+    if data_type.startswith(TEXT_TYPE_PREFIXES):
+        return _format_text_cell
+    if data_type.startswith(PLAIN_TYPE_PREFIXES):
+        return _format_plain_cell
+    # Anything else may or may not be decoded to a str, so check each value
+    return _format_any_cell
+
+
+def _format_data_table(header: str, formatters: List[Callable[[Any], str]], rows: List[Tuple]) -> str:
     """Format rows as markdown table"""
     if not rows:
         return "_No data_\n"
     
-    # Header
-    md = "| " + " | ".join(col_names) + " |\n"
-    md += "| " + " | ".join(["---"] * len(col_names)) + " |\n"
-    
-    # Data rows
-    for row in rows:
-        formatted_row = []
-        for val in row:
-            if val is None:
-                formatted_row.append("_null_")
-            elif isinstance(val, str) and len(val) > 50:
-                formatted_row.append(f"{val[:47]}...")
-            else:
-                formatted_row.append(str(val))
-        
-        md += "| " + " | ".join(formatted_row) + " |\n"
+    lines = [header]
+    lines.extend(
+        "| " + " | ".join([fmt(val) for fmt, val in zip(formatters, row)]) + " |\n"
+        for row in rows
+    )
     
-    return md
\ No newline at end of file
+    return "".join(lines)
@@ -5,7 +5,8 @@ Seed database with workout and food data from CSV files
 import csv
 import os
 import psycopg2
-from datetime import datetime
+from datetime import date
+from psycopg2.extras import execute_values
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -27,30 +28,29 @@ def seed_workouts(conn):
     csv_path = Path(__file__).parent / "workouts.csv"
     
     with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
         cursor = conn.cursor()
         
-        for row in reader:
-            # Convert date format
-            date = datetime.strptime(row['date'], '%Y-%m-%d').date()
-            
-            cursor.execute("""
-                INSERT INTO workouts (id, exercise, date, sets, reps, weight, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, NOW())
-                ON CONFLICT (id) DO UPDATE SET
-                    exercise = EXCLUDED.exercise,
-                    date = EXCLUDED.date,
-                    sets = EXCLUDED.sets,
-                    reps = EXCLUDED.reps,
-                    weight = EXCLUDED.weight
-            """, (
-                row['id'],
-                row['exercise'],
-                date,
-                int(row['sets']),
-                int(row['reps']),
-                float(row['weight'])
-            ))
+        # COPY the file into a temporary (unlogged, dropped at commit) staging
+        # table, then upsert from it in one statement; the server parses the
+        # CSV instead of planning an INSERT per page of rows
+        cursor.execute("""
+            CREATE TEMP TABLE workouts_stage (LIKE workouts INCLUDING DEFAULTS) ON COMMIT DROP
+        """)
+        cursor.copy_expert("""
+            COPY workouts_stage (id, exercise, date, sets, reps, weight, notes)
+            FROM STDIN WITH (FORMAT csv, HEADER true)
+        """, f)
+        cursor.execute("""
+            INSERT INTO workouts (id, exercise, date, sets, reps, weight, created_at)
+            SELECT id, exercise, date, sets, reps, weight, NOW()
+            FROM workouts_stage
+            ON CONFLICT (id) DO UPDATE SET
+                exercise = EXCLUDED.exercise,
+                date = EXCLUDED.date,
+                sets = EXCLUDED.sets,
+                reps = EXCLUDED.reps,
+                weight = EXCLUDED.weight
+        """)
         
         conn.commit()
         cursor.close()
@@ -60,37 +60,44 @@ def seed_food(conn):
     """Load food data from CSV"""
     csv_path = Path(__file__).parent / "food.csv"
     
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
         cursor = conn.cursor()
         
-        for row in reader:
-            # Convert date format
-            date = datetime.strptime(row['date'], '%Y-%m-%d').date()
-            
-            cursor.execute("""
-                INSERT INTO food (id, dish_name, meal_type, estimated_calories, protein_grams, carbs_grams, fat_grams, feeling_after, date, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                ON CONFLICT (id) DO UPDATE SET
-                    dish_name = EXCLUDED.dish_name,
-                    meal_type = EXCLUDED.meal_type,
-                    estimated_calories = EXCLUDED.estimated_calories,
-                    protein_grams = EXCLUDED.protein_grams,
-                    carbs_grams = EXCLUDED.carbs_grams,
-                    fat_grams = EXCLUDED.fat_grams,
-                    feeling_after = EXCLUDED.feeling_after,
-                    date = EXCLUDED.date
-            """, (
-                row['id'],
-                row['dish_name'],
-                row['meal_type'] if row['meal_type'] else None,
-                int(row['calories']),
-                float(row['protein']),
-                float(row['carbs']),
-                float(row['fats']),
-                row['feeling_after'] if row['feeling_after'] else None,
-                date
-            ))
+        # Columns by position: id, dish_name, protein, carbs, fats, fiber,
+        # calories, liked, meal_type, date, feeling_after
+        next(reader)
+        
+        # Parse the whole file up front; dates are ISO YYYY-MM-DD
+        rows = [
+            (
+                row[0],
+                row[1],
+                row[8] or None,
+                int(row[6]),
+                float(row[2]),
+                float(row[3]),
+                float(row[4]),
+                row[10] or None,
+                date.fromisoformat(row[9])
+            )
+            for row in reader
+        ]
+        
+        # One multi-row upsert per page instead of a round trip per CSV row
+        execute_values(cursor, """
+            INSERT INTO food (id, dish_name, meal_type, estimated_calories, protein_grams, carbs_grams, fat_grams, feeling_after, date, created_at)
+            VALUES %s
+            ON CONFLICT (id) DO UPDATE SET
+                dish_name = EXCLUDED.dish_name,
+                meal_type = EXCLUDED.meal_type,
+                estimated_calories = EXCLUDED.estimated_calories,
+                protein_grams = EXCLUDED.protein_grams,
+                carbs_grams = EXCLUDED.carbs_grams,
+                fat_grams = EXCLUDED.fat_grams,
+                feeling_after = EXCLUDED.feeling_after,
+                date = EXCLUDED.date
+        """, rows, template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())", page_size=1000)
         
         conn.commit()
         cursor.close()
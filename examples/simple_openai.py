@@ -8,11 +8,12 @@ load_dotenv()
 
 # Setup
 weave_client = weave.init("quantified-self-test")
+# One client for every call, so its HTTP connection pool is reused
+client = OpenAI()
 
 
 @weave.op()
 def extract_fruit(sentence: str) -> dict:
-    client = OpenAI()
     system_prompt = (
         "Parse sentences into a JSON dict with keys: fruit, color and flavor."
     )
@@ -3,30 +3,31 @@
 Add UUID IDs to workouts.csv
 """
 import csv
+import os
 import uuid
 from pathlib import Path
 
 def add_ids_to_workouts():
     input_file = Path(__file__).parent.parent / "demo" / "seed" / "workouts.csv"
     output_file = input_file
+    temp_file = output_file.with_suffix(".csv.tmp")
     
-    # Read existing data
-    rows = []
-    with open(input_file, 'r') as f:
-        reader = csv.DictReader(f)
+    # Stream rows into a temp file with id column first, then swap it in
+    count = 0
+    with open(input_file, 'r', newline='') as fin, open(temp_file, 'w', newline='') as fout:
+        reader = csv.DictReader(fin)
+        fieldnames = ['id', 'exercise', 'date', 'sets', 'reps', 'weight', 'notes']
+        writer = csv.DictWriter(fout, fieldnames=fieldnames)
+        writer.writeheader()
         for row in reader:
             # Generate UUID for each row
             row['id'] = str(uuid.uuid4())
-            rows.append(row)
+            writer.writerow(row)
+            count += 1
     
-    # Write back with id column first
-    with open(output_file, 'w', newline='') as f:
-        fieldnames = ['id', 'exercise', 'date', 'sets', 'reps', 'weight', 'notes']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    os.replace(temp_file, output_file)
     
-    print(f"Added UUIDs to {len(rows)} workout records")
+    print(f"Added UUIDs to {count} workout records")
 
 if __name__ == "__main__":
     add_ids_to_workouts()
\ No newline at end of file
@@ -1,22 +1,26 @@
 #!/usr/bin/env python3
 """Seed database with demo CSV data for quantified self demo"""
 
+import asyncio
 import csv
+import io
 import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
+from psycopg2 import sql
 
-# Add the src directory to the path so we can import the database module
+# Add the project root to the path so the MCP server package (and its shared
+# db instance) can be imported the same way the server imports it
 project_root = Path(__file__).parent.parent
-sys.path.append(str(project_root / "apps" / "mcp_server" / "src"))
+sys.path.insert(0, str(project_root))
 
-from database import db
-from tools.table_metadata import store_metadata
-
-# Load environment variables
+# Load environment variables before the database module reads DATABASE_URL
 load_dotenv(project_root / ".env")
 
+from apps.mcp_server.src.database import db
+from apps.mcp_server.src.tools.table_metadata import TABLE_METADATA_UPSERT_SQL, ensure_metadata_table
+
 async def create_tables_with_metadata():
     """Create all demo tables with their metadata"""
     
@@ -35,8 +39,7 @@ async def create_tables_with_metadata():
     )
     """
     
-    await db.execute_query(workouts_sql)
-    await store_metadata(
+    workouts = (workouts_sql, dict(
         table_name="workouts",
         description="Exercise and strength training sessions",
         purpose="Track workout progress, strength gains, and exercise patterns",
@@ -46,7 +49,7 @@ async def create_tables_with_metadata():
             "typical_rep_ranges": "3-10 reps per set",
             "data_patterns": "Users often track compound movements most consistently"
         }
-    )
+    ))
     
     # Create food table
     food_sql = """
@@ -66,8 +69,7 @@ async def create_tables_with_metadata():
     )
     """
     
-    await db.execute_query(food_sql)
-    await store_metadata(
+    food = (food_sql, dict(
         table_name="food",
         description="Nutritional intake and meal tracking",
         purpose="Monitor nutrition balance, food preferences, and eating patterns",
@@ -77,7 +79,7 @@ async def create_tables_with_metadata():
             "preference_tracking": "Boolean 'liked' field helps identify food preferences",
             "portion_estimation": "Users often estimate macros, exact precision not expected"
         }
-    )
+    ))
     
     # Create sleep table
     sleep_sql = """
@@ -94,8 +96,7 @@ async def create_tables_with_metadata():
     )
     """
     
-    await db.execute_query(sleep_sql)
-    await store_metadata(
+    sleep = (sleep_sql, dict(
         table_name="sleep",
         description="Sleep patterns and quality tracking",
         purpose="Analyze sleep quality, duration patterns, and correlation with other metrics",
@@ -105,7 +106,7 @@ async def create_tables_with_metadata():
             "dream_tracking": "Binary tracking of dream recall as sleep quality indicator",
             "bedtime_patterns": "Earlier bedtimes correlate with better quality ratings"
         }
-    )
+    ))
     
     # Create mood table
     mood_sql = """
@@ -120,8 +121,7 @@ async def create_tables_with_metadata():
     )
     """
     
-    await db.execute_query(mood_sql)
-    await store_metadata(
+    mood = (mood_sql, dict(
         table_name="mood",
         description="Emotional state and energy level tracking",
         purpose="Track mood patterns, energy cycles, and stress levels for wellbeing insights",
@@ -131,56 +131,82 @@ async def create_tables_with_metadata():
             "daily_variation": "Mood and energy often vary throughout the day",
             "correlation_potential": "Strong correlation candidates with sleep and exercise"
         }
-    )
+    ))
+    
+    await db.run_in_transaction(_create_tables, [workouts, food, sleep, mood])
+
+
+def _create_tables(cursor, tables: list):
+    """Send every CREATE TABLE and table metadata upsert as one batch"""
+    statements = [create_sql.encode() for create_sql, _ in tables]
+    statements += [
+        cursor.mogrify(TABLE_METADATA_UPSERT_SQL, (metadata["table_name"], metadata["description"], metadata["purpose"]))
+        for _, metadata in tables
+    ]
+    
+    # A single execute sends every statement in one round trip
+    cursor.execute(b";".join(statements))
 
 
 async def load_csv_data(table_name: str, csv_file: Path):
     """Load data from CSV file into specified table"""
     print(f"Loading {csv_file.name} into {table_name} table...")
     
-    with open(csv_file, 'r') as file:
-        reader = csv.DictReader(file)
-        rows_inserted = 0
-        
-        for row in reader:
-            # Remove id and created_at if present (let database handle these)
-            if 'id' in row:
-                del row['id']
-            if 'created_at' in row:
-                del row['created_at']
-            
-            # Convert empty strings to None
-            for key, value in row.items():
-                if value == '':
-                    row[key] = None
-                elif key in ['liked', 'dream_recall'] and value:
-                    # Convert boolean strings
-                    row[key] = value.lower() in ['true', '1', 'yes']
-                elif key in ['sets', 'reps', 'duration_minutes', 'calories', 'quality_rating', 
-                           'mood_rating', 'energy_level', 'stress_level'] and value:
-                    # Convert integer fields
-                    row[key] = int(value)
-                elif key in ['weight', 'protein', 'carbs', 'fats', 'fiber', 'duration_hours'] and value:
-                    # Convert float fields
-                    row[key] = float(value)
-            
-            # Build INSERT query
-            columns = list(row.keys())
-            placeholders = ', '.join(['$' + str(i+1) for i in range(len(columns))])
-            values = list(row.values())
-            
-            insert_sql = f"""
-            INSERT INTO {table_name} ({', '.join(columns)}) 
-            VALUES ({placeholders})
-            """
-            
-            success = await db.execute_query(insert_sql, *values)
-            if success:
-                rows_inserted += 1
-            else:
-                print(f"Failed to insert row: {row}")
+    rows_inserted = await db.run_in_transaction(_copy_csv, table_name, csv_file)
+    
+    print(f"Successfully inserted {rows_inserted} rows into {table_name}")
+
+
+def _copy_csv(cursor, table_name: str, csv_file: Path) -> int:
+    """Stream a CSV into a table with one COPY, returning the number of rows loaded
+    
+    id and created_at are left to the database defaults; empty fields load as
+    NULL and Postgres casts the remaining text to each column's type.
+    """
+    with open(csv_file, 'r', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        keep = [i for i, column in enumerate(header) if column not in ('id', 'created_at')]
         
-        print(f"Successfully inserted {rows_inserted} rows into {table_name}")
+        copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '')").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(sql.Identifier(header[i]) for i in keep),
+        )
+        # COPY pulls rewritten lines as it sends them, so only one read-sized
+        # chunk of the file is in memory at a time
+        cursor.copy_expert(copy_sql, _LineReader(_kept_csv_lines(reader, keep)))
+    return cursor.rowcount
+
+
+def _kept_csv_lines(reader, keep: list):
+    """Yield each CSV row as a line holding only the kept fields"""
+    # COPY takes every field in the stream, so the dropped columns are cut here
+    line = io.StringIO()
+    writer = csv.writer(line)
+    for row in reader:
+        writer.writerow([row[i] for i in keep])
+        yield line.getvalue()
+        line.seek(0)
+        line.truncate()
+
+
+class _LineReader:
+    """Minimal file object over an iterator of text lines, for copy_expert"""
+    
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = ""
+    
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
 
 
 async def main():
@@ -194,6 +220,9 @@ async def main():
     
     print("✅ Connected to database")
     
+    # A fresh database has no table_metadata yet; create it the way the server does
+    await ensure_metadata_table()
+    
     # Create tables and metadata
     await create_tables_with_metadata()
     print("✅ Created tables with metadata")
@@ -207,12 +236,15 @@ async def main():
         ("mood", "mood_demo.csv")
     ]
     
+    # Each load runs on its own pooled connection, so the files load concurrently
+    loads = []
     for table_name, csv_filename in csv_files:
         csv_path = data_dir / csv_filename
         if csv_path.exists():
-            await load_csv_data(table_name, csv_path)
+            loads.append(load_csv_data(table_name, csv_path))
         else:
             print(f"⚠️  CSV file not found: {csv_path}")
+    await asyncio.gather(*loads)
     
     # Close database connection
     db.close()
@@ -220,5 +252,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
\ No newline at end of file
@@ -1,30 +1,49 @@
 # sqlite-server.py
 from mcp.server.fastmcp import FastMCP
 import sqlite3
+import threading
+from typing import Optional
 
 # Initialize the MCP server with a friendly name
 mcp = FastMCP("Community Chatters")
 
+# A negative LIMIT means no limit in SQLite
+TOP_CHATTERS_SQL = "SELECT name, messages FROM chatters ORDER BY messages DESC LIMIT ?"
+
+# One connection for the server's lifetime, opened on first use; the lock
+# serializes access in case tools are called from more than one thread
+_conn = None
+_conn_lock = threading.Lock()
+
+
+def _get_connection():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect('community.db', check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+        # WAL lets reads proceed alongside writers; mmap serves reads from the page cache
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.execute("PRAGMA mmap_size=268435456")
+        # Covering index so the top chatters come straight off the index in order
+        _conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chatters_messages_desc ON chatters (messages DESC, name)")
+    return _conn
+
+
 # Define a tool to fetch the top chatters from the SQLite database
 
 
 @mcp.tool()
-def get_top_chatters():
-    """Retrieve the top chatters sorted by number of messages."""
-    # Connect to the SQLite database
-    conn = sqlite3.connect('community.db')
-    cursor = conn.cursor()
-
+def get_top_chatters(limit: Optional[int] = None):
+    """Retrieve the top chatters sorted by number of messages, optionally only the first `limit`."""
     # Execute the query to fetch chatters sorted by messages
-    cursor.execute(
-        "SELECT name, messages FROM chatters ORDER BY messages DESC")
-    results = cursor.fetchall()
-    conn.close()
+    with _conn_lock:
+        results = _get_connection().execute(
+            TOP_CHATTERS_SQL, (-1 if limit is None else limit,)).fetchall()
 
     # Format the results as a list of dictionaries
-    chatters = [{"name": name, "messages": messages}
-                for name, messages in results]
-    return chatters
+    return [dict(row) for row in results]
 
 
 @mcp.tool()
@@ -0,0 +1,25 @@
+"""Shared pytest setup for the test suite"""
+
+import os
+import tempfile
+
+import pytest
+
+# Headless backend and a throwaway config dir in case real matplotlib is
+# loaded, so it neither probes GUI toolkits nor builds a font cache in $HOME
+os.environ.setdefault("MPLBACKEND", "Agg")
+if "MPLCONFIGDIR" not in os.environ:
+    os.environ["MPLCONFIGDIR"] = tempfile.mkdtemp(prefix="mpl-")
+
+# The MCP server's global db object requires DATABASE_URL at import; unit tests
+# never connect, so any well-formed URL will do
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/qs_test")
+
+
+@pytest.fixture(scope="session")
+def researcher_env():
+    """Set EXA_API_KEY once for the whole session instead of per research test"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("EXA_API_KEY", "test-key-123")
+        yield
+
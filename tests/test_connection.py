@@ -15,31 +15,34 @@ try:
     conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
     cursor = conn.cursor()
     
-    # Test basic query
-    cursor.execute("SELECT version();")
-    version = cursor.fetchone()
-    print(f"✅ Connected to PostgreSQL: {version['version'][:50]}...")
-    
-    # Test if we can see tables
+    # Version and visible tables in one round trip
     cursor.execute("""
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_schema = 'public' 
-        ORDER BY table_name;
+        SELECT version(),
+               ARRAY(
+                   SELECT table_name::text
+                   FROM information_schema.tables
+                   WHERE table_schema = 'public'
+                   ORDER BY table_name
+               ) AS tables;
     """)
-    tables = cursor.fetchall()
+    result = cursor.fetchone()
+    print(f"✅ Connected to PostgreSQL: {result['version'][:50]}...")
     
+    tables = result['tables']
     if tables:
         print(f"✅ Found {len(tables)} tables:")
-        for table in tables:
-            print(f"   - {table['table_name']}")
+        for table_name in tables:
+            print(f"   - {table_name}")
     else:
         print("ℹ️  No tables found - database is empty")
     
-    # Test UUID extension
-    cursor.execute("SELECT uuid_generate_v4() as test_uuid;")
-    uuid_result = cursor.fetchone()
-    print(f"✅ UUID extension working: {uuid_result['test_uuid']}")
+    # Separate statement so a missing uuid-ossp extension doesn't hide the checks above
+    try:
+        cursor.execute("SELECT uuid_generate_v4() AS test_uuid;")
+        print(f"✅ UUID extension working: {cursor.fetchone()['test_uuid']}")
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"⚠️  UUID extension not available: {e}")
     
     cursor.close()
     conn.close()
@@ -0,0 +1,38 @@
+"""Tests for the cached CREATE TABLE template in the create_table tool"""
+
+import pytest
+from psycopg2 import sql
+
+from apps.mcp_server.src.tools.create_table import _create_table_template
+
+def _text(template: sql.SQL) -> str:
+    """Template text with whitespace collapsed"""
+    return " ".join(template.string.split())
+
+@pytest.mark.parametrize("column_shape,columns", [
+    ((), ""),
+    ((("REAL", False),), "{} REAL, "),
+    ((("TEXT", True), ("NUMERIC(5,2)", False)), "{} TEXT NOT NULL, {} NUMERIC(5,2), "),
+    ((("TIMESTAMPTZ", True), ("INTEGER[]", True)), "{} TIMESTAMPTZ NOT NULL, {} INTEGER[] NOT NULL, "),
+])
+def test_template_lays_out_standard_and_custom_columns(column_shape, columns):
+    """id and date come first, created_at last, custom columns in order with NOT NULL when required"""
+    assert _text(_create_table_template(column_shape)) == (
+        "CREATE TABLE {} ( id UUID PRIMARY KEY DEFAULT uuid_generate_v4(), "
+        f"date TIMESTAMP NOT NULL, {columns}created_at TIMESTAMP DEFAULT NOW() )"
+    )
+
+def test_template_takes_table_then_column_identifiers():
+    """The {} slots are filled with the table identifier followed by each column's"""
+    composed = _create_table_template((("TEXT", True),)).format(
+        sql.Identifier('workouts'), sql.Identifier('exercise')
+    )
+    assert [part for part in composed.seq if isinstance(part, sql.Identifier)] == [
+        sql.Identifier('workouts'), sql.Identifier('exercise'),
+    ]
+
+def test_template_is_cached_per_shape():
+    """Tables with the same column types and NOT NULL flags share one template"""
+    shape = (("TEXT", False), ("REAL", True))
+    assert _create_table_template(shape) is _create_table_template(tuple(shape))
+    assert _create_table_template(shape) is not _create_table_template((("TEXT", True), ("REAL", True)))
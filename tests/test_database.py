@@ -0,0 +1,120 @@
+"""Tests for the schema snapshot cache in DatabaseConnection"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from apps.mcp_server.src import database
+from apps.mcp_server.src.database import SCHEMA_EPOCH_QUERY, DatabaseConnection
+
+class FakeCatalog:
+    """run_query stand-in serving an epoch and a snapshot, logging which was asked for"""
+
+    def __init__(self):
+        self.epoch = 'e1'
+        self.has_writes = False
+        self.tables = ['workouts']
+        self.queries = []
+
+    def __call__(self, query):
+        if query == SCHEMA_EPOCH_QUERY:
+            self.queries.append('epoch')
+            return [{'epoch': self.epoch, 'has_writes': self.has_writes}]
+        self.queries.append('snapshot')
+        return [{'table_name': name} for name in self.tables]
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable monotonic clock for the database module"""
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(database, 'time', SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+@pytest.fixture
+def catalog():
+    """A fresh FakeCatalog at epoch e1 with one table"""
+    return FakeCatalog()
+
+@pytest.fixture
+def conn():
+    """A DatabaseConnection that never connects"""
+    return DatabaseConnection()
+
+def test_first_load_fetches_and_stores_snapshot(conn, catalog, clock):
+    """A cold cache checks the epoch, loads the snapshot and keeps it"""
+    schema = conn._load_schema(catalog, refresh=False, max_age=30.0)
+
+    assert list(schema) == ['workouts']
+    assert catalog.queries == ['epoch', 'snapshot']
+    assert conn._schema_cache is schema
+
+def test_snapshot_within_ttl_needs_no_query(conn, catalog, clock):
+    """Inside max_age the cached snapshot is returned without touching the database"""
+    first = conn._load_schema(catalog, refresh=False, max_age=30.0)
+    clock.now += 29.0
+
+    assert conn._load_schema(catalog, refresh=False, max_age=30.0) is first
+    assert catalog.queries == ['epoch', 'snapshot']
+
+def test_expired_ttl_with_same_epoch_is_a_cache_hit(conn, catalog, clock):
+    """After max_age only the epoch is re-checked; an unchanged epoch keeps the snapshot"""
+    first = conn._load_schema(catalog, refresh=False, max_age=30.0)
+    clock.now += 31.0
+
+    assert conn._load_schema(catalog, refresh=False, max_age=30.0) is first
+    assert catalog.queries == ['epoch', 'snapshot', 'epoch']
+
+    # The hit restarted the TTL
+    clock.now += 29.0
+    conn._load_schema(catalog, refresh=False, max_age=30.0)
+    assert catalog.queries == ['epoch', 'snapshot', 'epoch']
+
+def test_changed_epoch_reloads_snapshot(conn, catalog, clock):
+    """A moved epoch replaces the cached snapshot"""
+    conn._load_schema(catalog, refresh=False)
+    catalog.epoch, catalog.tables = 'e2', ['workouts', 'sleep']
+
+    schema = conn._load_schema(catalog, refresh=False)
+
+    assert list(schema) == ['workouts', 'sleep']
+    assert catalog.queries == ['epoch', 'snapshot', 'epoch', 'snapshot']
+    assert conn._schema_cache is schema
+
+def test_invalidated_cache_reloads_despite_same_epoch(conn, catalog, clock):
+    """invalidate_schema_cache forces a reload even when neither TTL nor epoch moved"""
+    conn._load_schema(catalog, refresh=False, max_age=30.0)
+    conn.invalidate_schema_cache()
+
+    conn._load_schema(catalog, refresh=False, max_age=30.0)
+
+    assert catalog.queries == ['epoch', 'snapshot', 'epoch', 'snapshot']
+    assert conn._schema_cache is not None
+
+def test_refresh_reloads_despite_same_epoch(conn, catalog, clock):
+    """refresh=True skips both the TTL and the epoch comparison"""
+    conn._load_schema(catalog, refresh=False, max_age=30.0)
+
+    conn._load_schema(catalog, refresh=True, max_age=30.0)
+
+    assert catalog.queries == ['epoch', 'snapshot', 'epoch', 'snapshot']
+
+def test_store_false_keeps_uncommitted_snapshot_private(conn, catalog, clock):
+    """A snapshot read by a transaction that has written is returned but not cached"""
+    cached = conn._load_schema(catalog, refresh=False)
+    catalog.epoch, catalog.tables, catalog.has_writes = 'e2', ['workouts', 'draft'], True
+
+    schema = conn._load_schema(catalog, refresh=False, store=False)
+
+    assert list(schema) == ['workouts', 'draft']
+    assert conn._schema_cache is cached
+    assert conn._meta_epoch == 'e1'
+
+def test_store_false_caches_when_transaction_is_clean(conn, catalog, clock):
+    """A transaction that hasn't written only sees committed schema, so its snapshot is shared"""
+    conn._load_schema(catalog, refresh=False)
+    catalog.epoch, catalog.tables = 'e2', ['workouts', 'sleep']
+
+    schema = conn._load_schema(catalog, refresh=False, store=False)
+
+    assert conn._schema_cache is schema
+    assert conn._meta_epoch == 'e2'
@@ -0,0 +1,111 @@
+"""Tests for the statements edit_table_schema runs inside its transaction"""
+
+import pytest
+from psycopg2 import sql
+
+from apps.mcp_server.src.tools import edit_table_schema
+from apps.mcp_server.src.tools.edit_table_schema import _add_column_template, _apply_operations
+from apps.mcp_server.src.tools.table_metadata import COLUMN_METADATA_UPSERT_SQL
+
+_SCHEMA = {
+    'workouts': {
+        'table_name': 'workouts',
+        'columns': [
+            {'column_name': 'id', 'data_type': 'uuid'},
+            {'column_name': 'exercise', 'data_type': 'text'},
+            {'column_name': 'weight', 'data_type': 'numeric'},
+        ],
+    },
+}
+
+def _render(query):
+    """Flatten a psycopg2.sql object to text without a connection"""
+    if isinstance(query, sql.Composed):
+        return "".join(_render(part) for part in query.seq)
+    if isinstance(query, sql.Identifier):
+        return ".".join(f'"{name}"' for name in query.strings)
+    if isinstance(query, sql.SQL):
+        return query.string
+    return " ".join(str(query).split())
+
+class RecordingCursor:
+    """Cursor stand-in that records every statement and its parameters"""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, query, params=None):
+        self.statements.append((_render(query), params))
+
+@pytest.fixture
+def cursor(monkeypatch):
+    """A recording cursor, with the schema snapshot served from _SCHEMA"""
+    monkeypatch.setattr(edit_table_schema.db, 'get_schema_with', lambda cursor: _SCHEMA)
+    monkeypatch.setattr(
+        edit_table_schema, 'execute_values',
+        lambda cur, query, rows, page_size=100: cur.statements.append((_render(query), list(rows))),
+    )
+    return RecordingCursor()
+
+def test_rename_table_updates_table_metadata(cursor):
+    """A rename-only edit touches the renamed table and the table_metadata row"""
+    results, table_name = _apply_operations(cursor, 'workouts', [{'action': 'rename_table', 'new_name': 'sessions'}])
+
+    assert table_name == 'sessions'
+    assert results == ["✅ Renamed table 'workouts' to 'sessions'"]
+    assert cursor.statements == [
+        ('ALTER TABLE "workouts" RENAME TO "sessions"', None),
+        ('UPDATE table_metadata SET updated_at = CURRENT_TIMESTAMP WHERE table_name = %s', ('sessions',)),
+    ]
+
+def test_add_column_upserts_column_metadata(cursor):
+    """Added columns get their column_metadata rows from the shared upsert, in its column order"""
+    operations = [
+        {'action': 'add_column', 'name': 'mood', 'type': 'INTEGER', 'description': 'Mood 1-5'},
+        {'action': 'add_column', 'name': 'exercise', 'type': 'TEXT'},
+    ]
+    results, _ = _apply_operations(cursor, 'workouts', operations)
+
+    assert results[1] == "ℹ️ Column 'exercise' already exists - skipped"
+    assert _render(COLUMN_METADATA_UPSERT_SQL).startswith("INSERT INTO column_metadata ")
+    assert cursor.statements == [
+        ('ALTER TABLE "workouts" ADD COLUMN "mood" INTEGER;', None),
+        (_render(COLUMN_METADATA_UPSERT_SQL), [('workouts', 'mood', 'Mood 1-5', 'INTEGER', None)]),
+        ('UPDATE table_metadata SET updated_at = CURRENT_TIMESTAMP WHERE table_name = %s', ('workouts',)),
+    ]
+
+@pytest.mark.parametrize("operation,ddl,metadata", [
+    ({'action': 'remove_column', 'name': 'weight'},
+     'ALTER TABLE "workouts" DROP COLUMN "weight"',
+     ('DELETE FROM column_metadata WHERE table_name = %s AND column_name = %s', ('workouts', 'weight'))),
+    ({'action': 'rename_column', 'old_name': 'weight', 'new_name': 'load'},
+     'ALTER TABLE "workouts" RENAME COLUMN "weight" TO "load"',
+     ('UPDATE column_metadata SET column_name = %s WHERE table_name = %s AND column_name = %s',
+      ('load', 'workouts', 'weight'))),
+    ({'action': 'change_column_type', 'name': 'weight', 'new_type': 'REAL'},
+     'ALTER TABLE "workouts" ALTER COLUMN "weight" TYPE REAL',
+     ('UPDATE column_metadata SET data_type = %s WHERE table_name = %s AND column_name = %s',
+      ('REAL', 'workouts', 'weight'))),
+])
+def test_column_edits_update_column_metadata(cursor, operation, ddl, metadata):
+    """Column edits rewrite the matching column_metadata row"""
+    _apply_operations(cursor, 'workouts', [operation])
+
+    assert cursor.statements == [
+        (ddl, None),
+        metadata,
+        ('UPDATE table_metadata SET updated_at = CURRENT_TIMESTAMP WHERE table_name = %s', ('workouts',)),
+    ]
+
+@pytest.mark.parametrize("has_default,required,expected", [
+    (False, False, 'ALTER TABLE {table} ADD COLUMN {column} REAL;'),
+    (True, False, 'ALTER TABLE {table} ADD COLUMN {column} REAL DEFAULT {default};'),
+    (False, True, 'ALTER TABLE {table} ADD COLUMN {column} REAL NOT NULL;'),
+    (True, True, 'ALTER TABLE {table} ADD COLUMN {column} REAL DEFAULT {default} NOT NULL;'),
+])
+def test_add_column_template_clauses(has_default, required, expected):
+    """DEFAULT and NOT NULL are only added when asked for, and each shape is built once"""
+    template = _add_column_template('REAL', has_default, required)
+
+    assert template.string == expected
+    assert _add_column_template('REAL', has_default, required) is template
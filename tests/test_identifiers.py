@@ -0,0 +1,61 @@
+"""Tests for DDL identifier and column type validation"""
+
+import pytest
+
+from apps.mcp_server.src.tools.identifiers import normalize_data_type, normalize_identifier
+
+@pytest.mark.parametrize("name,expected", [
+    ("workouts", "workouts"),
+    ("Workouts", "workouts"),
+    ("avg_Heart_Rate", "avg_heart_rate"),
+    ("_private", "_private"),
+    ("sleep2", "sleep2"),
+    ("a" * 63, "a" * 63),
+])
+def test_normalize_identifier_accepts_plain_names(name, expected):
+    """Plain identifiers come back folded to lower case"""
+    assert normalize_identifier(name) == expected
+
+@pytest.mark.parametrize("name", [
+    "", "2fast", "weight lbs", "workouts;drop", 'quoted"name', "naïve", "a" * 64,
+    "user", "User", "order", "table", "current_date",
+    None, 42,
+])
+def test_normalize_identifier_rejects_unsafe_names(name):
+    """Unsafe, over-long, non-string and reserved names are rejected"""
+    assert normalize_identifier(name) is None
+
+@pytest.mark.parametrize("data_type,expected", [
+    ("text", "TEXT"),
+    ("VARCHAR(50)", "VARCHAR(50)"),
+    ("numeric( 5 , 2 )", "NUMERIC(5,2)"),
+    ("decimal(5,2)", "NUMERIC(5,2)"),
+    ("int", "INTEGER"),
+    ("int4", "INTEGER"),
+    ("int8", "BIGINT"),
+    ("serial", "SERIAL"),
+    ("float", "DOUBLE PRECISION"),
+    ("float(24)", "REAL"),
+    ("float(53)", "DOUBLE PRECISION"),
+    ("double  precision", "DOUBLE PRECISION"),
+    ("bool", "BOOLEAN"),
+    ("character varying(20)", "VARCHAR(20)"),
+    ("timestamp without time zone", "TIMESTAMP"),
+    ("timestamp with time zone", "TIMESTAMPTZ"),
+    ("timestamp(3) with time zone", "TIMESTAMPTZ(3)"),
+    ("time without time zone", "TIME"),
+    ("TEXT[]", "TEXT[]"),
+    ("integer[][]", "INTEGER[][]"),
+    ("jsonb", "JSONB"),
+])
+def test_normalize_data_type_maps_to_canonical_names(data_type, expected):
+    """Aliases and format_type() long names map onto ALLOWED_TYPES, keeping modifiers and arrays"""
+    assert normalize_data_type(data_type) == expected
+
+@pytest.mark.parametrize("data_type", [
+    "", "blob", "text; DROP TABLE workouts", "varchar(abc)", "float(2,3)",
+    "ARRAY", "USER-DEFINED", "[]", None,
+])
+def test_normalize_data_type_rejects_unknown_types(data_type):
+    """Unknown or malformed types are rejected"""
+    assert normalize_data_type(data_type) is None
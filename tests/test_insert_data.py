@@ -0,0 +1,101 @@
+"""Tests for row validation and batching in the insert_data tool"""
+
+import itertools
+
+import pytest
+from psycopg2 import sql
+
+from apps.mcp_server.src.tools import insert_data
+from apps.mcp_server.src.tools.insert_data import _insert_rows, _insert_template
+
+_SCHEMA = {
+    'workouts': {
+        'table_name': 'workouts',
+        'columns': [
+            {'column_name': 'id', 'data_type': 'uuid'},
+            {'column_name': 'date', 'data_type': 'timestamp without time zone'},
+            {'column_name': 'exercise', 'data_type': 'text'},
+            {'column_name': 'weight', 'data_type': 'real'},
+            {'column_name': 'created_at', 'data_type': 'timestamp without time zone'},
+        ],
+    },
+}
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Record each execute_values call as (statement, values), handing back sequential ids"""
+    calls = []
+    ids = itertools.count(1)
+
+    def fake_execute_values(cursor, query, values, page_size=100, fetch=False):
+        calls.append((query, values))
+        return [{'id': next(ids)} for _ in values]
+
+    monkeypatch.setattr(insert_data.db, 'get_schema_with', lambda cursor: _SCHEMA)
+    monkeypatch.setattr(insert_data, 'execute_values', fake_execute_values)
+    return calls
+
+def test_insert_template_quotes_table_and_columns():
+    """The statement quotes every identifier and returns the new ids"""
+    expected = sql.SQL("INSERT INTO {} ({}) VALUES %s RETURNING id").format(
+        sql.Identifier('workouts'),
+        sql.SQL(", ").join([sql.Identifier('date'), sql.Identifier('weight')]),
+    )
+    assert _insert_template('workouts', ('date', 'weight')) == expected
+
+def test_insert_template_is_cached_per_shape():
+    """Each table and column tuple is composed once"""
+    assert _insert_template('workouts', ('date',)) is _insert_template('workouts', ('date',))
+    assert _insert_template('workouts', ('date',)) is not _insert_template('sleep', ('date',))
+
+def test_rows_with_same_columns_share_one_batch(batches):
+    """Key order doesn't split a batch; values follow the sorted column order"""
+    rows = [
+        {'exercise': 'squat', 'weight': 205},
+        {'weight': 225, 'exercise': 'deadlift'},
+    ]
+    error, filtered_rows, new_ids = _insert_rows(None, 'workouts', rows)
+
+    assert error is None
+    assert filtered_rows == rows
+    assert new_ids == [1, 2]
+    assert batches == [
+        (_insert_template('workouts', ('exercise', 'weight')), [('squat', 205), ('deadlift', 225)]),
+    ]
+
+def test_rows_with_different_columns_keep_input_order_of_ids(batches):
+    """Each column set gets its own INSERT, and ids map back to the input rows"""
+    rows = [
+        {'exercise': 'squat'},
+        {'exercise': 'bench', 'weight': 185},
+        {'exercise': 'row'},
+    ]
+    error, _, new_ids = _insert_rows(None, 'workouts', rows)
+
+    assert error is None
+    assert [values for _, values in batches] == [[('squat',), ('row',)], [('bench', 185)]]
+    assert new_ids == [1, 3, 2]
+
+def test_auto_generated_columns_are_dropped(batches):
+    """id and created_at are left to the table defaults"""
+    error, filtered_rows, _ = _insert_rows(None, 'workouts', [{'id': 'x', 'created_at': 'now', 'weight': 100}])
+
+    assert error is None
+    assert filtered_rows == [{'weight': 100}]
+
+@pytest.mark.parametrize("table_name,rows,error", [
+    ('sleep', [{'hours': 7}], "❌ Table 'sleep' does not exist"),
+    ('workouts', [{'weight': 1}, {'reps': 5}], "❌ Column 'reps' does not exist in table 'workouts'"),
+    ('workouts', [{'id': 'x'}], "❌ No valid data provided for table 'workouts'"),
+])
+def test_invalid_rows_are_rejected_before_any_insert(batches, table_name, rows, error):
+    """Schema errors come back as messages and nothing is inserted"""
+    assert _insert_rows(None, table_name, rows) == (error, [], [])
+    assert batches == []
+
+def test_short_batch_raises_to_roll_back(batches, monkeypatch):
+    """A batch returning fewer ids than rows raises so the transaction rolls back"""
+    monkeypatch.setattr(insert_data, 'execute_values', lambda *args, **kwargs: [])
+
+    with pytest.raises(RuntimeError, match="expected 1 rows inserted into 'workouts', got 0"):
+        _insert_rows(None, 'workouts', [{'weight': 1}])
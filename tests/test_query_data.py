@@ -0,0 +1,41 @@
+"""Tests for the statement screen in the query_data tool"""
+
+import asyncio
+
+import pytest
+
+from apps.mcp_server.src.tools.query_data import DANGEROUS_KEYWORDS, handle_query_data
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM workouts",
+    "SELECT updated_at FROM table_metadata",
+    "SELECT deleted, dropped_sets FROM workouts",
+    "SELECT * FROM workouts WHERE notes LIKE '%dropbox%'",
+    "SELECT inserted_rows, alteration, truncated FROM imports",
+    "SELECT exercise FROM workouts_update_log",
+    "WITH recent AS (SELECT * FROM sleep) SELECT * FROM recent",
+    "EXPLAIN SELECT * FROM workouts",
+])
+def test_dangerous_keywords_allow_identifiers_containing_keywords(query):
+    """Keywords only match as whole words, so columns like updated_at pass"""
+    assert DANGEROUS_KEYWORDS.search(query) is None
+
+@pytest.mark.parametrize("query,keyword", [
+    ("DELETE FROM workouts", "DELETE"),
+    ("drop table workouts", "drop"),
+    ("SELECT 1; Drop Table workouts", "Drop"),
+    ("TRUNCATE sleep", "TRUNCATE"),
+    ("ALTER TABLE sleep ADD COLUMN x INT", "ALTER"),
+    ("INSERT INTO mood (mood_rating) VALUES (5)", "INSERT"),
+    ("UPDATE workouts SET weight = 0", "UPDATE"),
+    ("WITH gone AS (DELETE FROM mood RETURNING *) SELECT * FROM gone", "DELETE"),
+    ("SELECT 1;\nupdate\tworkouts SET sets = 0", "update"),
+])
+def test_dangerous_keywords_reject_write_statements(query, keyword):
+    """Write and DDL keywords are caught in any case and position"""
+    assert DANGEROUS_KEYWORDS.search(query).group(0) == keyword
+
+def test_handle_query_data_rejects_before_touching_database():
+    """A rejected statement is reported by keyword without opening a connection"""
+    result = asyncio.run(handle_query_data({'sql': 'delete from workouts'}))
+    assert result == "❌ DELETE operations are not allowed"
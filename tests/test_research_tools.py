@@ -1,19 +1,17 @@
 #!/usr/bin/env python3
 """Test script for research tools with mocked inputs and outputs"""
 
-import sys
 import os
 from unittest.mock import Mock, patch, MagicMock
 
-# Add the research_agent directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'research_agent'))
+import pytest
 
-def test_internet_research():
-    """Test internet_research function with mocked Exa API"""
-    print("🔍 Testing internet_research...")
-    
-    # Mock research response
-    mock_research_response = """
+# research_agent is not always checked out next to the MCP server; skip rather
+# than fail collection for the whole suite
+research_module = pytest.importorskip("research_agent.tools.research")
+from research_agent.tools.research import ExaResearcher, internet_research, research_correlations
+
+MOCK_RESEARCH_RESPONSE = """
 ## Key Findings and Insights
 
 • Sleep quality has a direct correlation with next-day productivity and cognitive performance
@@ -40,39 +38,9 @@ def test_internet_research():
 • Create a dark, cool (65-68°F) sleep environment
 • Limit screen time 1 hour before bed
 • Track sleep patterns to identify personal optimization opportunities
-    """
-    
-    # Mock the OpenAI client response
-    mock_completion = Mock()
-    mock_completion.choices = [Mock()]
-    mock_completion.choices[0].message.content = mock_research_response
-    
-    with patch('research_agent.tools.research.researcher') as mock_researcher:
-        mock_researcher.search.return_value = mock_research_response
-        
-        from research_agent.tools.research import internet_research
-        
-        # Test basic research
-        query = "sleep quality and productivity correlation"
-        result = internet_research(query)
-        
-        print("✅ Internet research result:")
-        print(result[:500] + "..." if len(result) > 500 else result)
-        print()
-        
-        # Test research with context
-        context = "Personal data shows average 6.5 hours sleep with 3.2/5 quality rating"
-        result = internet_research(query, context)
-        
-        print("✅ Internet research with context:")
-        print(result[:500] + "..." if len(result) > 500 else result)
-        print()
+"""
 
-def test_research_correlations():
-    """Test research_correlations function"""
-    print("🔍 Testing research_correlations...")
-    
-    mock_correlation_response = """
+MOCK_CORRELATION_RESPONSE = """
 ## Internet Research: Research studies and findings about exercise and mood correlation. What do experts and scientific studies say about these correlations?
 
 **Context from database analysis**: Personal data shows: Higher intensity workouts (>150 heart rate) correlate with improved mood ratings the following day
@@ -105,92 +73,76 @@ def test_research_correlations():
 • Schedule workouts during times when mood boost is most needed
 • Track mood 2-24 hours post-workout to identify personal patterns
 • Combine cardio with strength training for comprehensive mood benefits
-    """
+"""
+
+def test_internet_research(researcher_env):
+    """Test internet_research function with mocked Exa API"""
+    # Mock the OpenAI client response
+    mock_completion = Mock()
+    mock_completion.choices = [Mock()]
+    mock_completion.choices[0].message.content = MOCK_RESEARCH_RESPONSE
     
-    with patch('research_agent.tools.research.internet_research') as mock_internet_research:
-        mock_internet_research.return_value = mock_correlation_response
+    with patch('research_agent.tools.research.researcher') as mock_researcher:
+        mock_researcher.search.return_value = MOCK_RESEARCH_RESPONSE
+        
+        # Test basic research
+        query = "sleep quality and productivity correlation"
+        result = internet_research(query)
+        
+        assert isinstance(result, str) and result
+        assert "Sleep quality" in result
         
-        from research_agent.tools.research import research_correlations
+        # Test research with context
+        context = "Personal data shows average 6.5 hours sleep with 3.2/5 quality rating"
+        result = internet_research(query, context)
+        
+        assert isinstance(result, str) and result
+        assert "Sleep quality" in result
+
+def test_research_correlations(researcher_env):
+    """Test research_correlations function"""
+    with patch('research_agent.tools.research.internet_research') as mock_internet_research:
+        mock_internet_research.return_value = MOCK_CORRELATION_RESPONSE
         
         topic = "exercise and mood correlation"
         data_insights = "Higher intensity workouts (>150 heart rate) correlate with improved mood ratings the following day"
         
         result = research_correlations(topic, data_insights)
         
-        print("✅ Research correlations result:")
-        print(result[:600] + "..." if len(result) > 600 else result)
-        print()
+        assert isinstance(result, str) and result
+        assert "Exercise releases endorphins" in result
 
-def test_research_error_handling():
+def test_research_error_handling(researcher_env, monkeypatch):
     """Test error handling scenarios for research tools"""
-    print("🔍 Testing research error handling...")
+    # Mock API error
+    monkeypatch.setattr(research_module, 'researcher', Mock(**{'search.side_effect': Exception("API key invalid")}))
     
-    with patch('research_agent.tools.research.researcher') as mock_researcher:
-        # Mock API error
-        mock_researcher.search.side_effect = Exception("API key invalid")
-        
-        from research_agent.tools.research import internet_research, research_correlations
-        
-        # Test internet_research error
-        result = internet_research("test query")
-        print("✅ Internet research error handling:")
-        print(result)
-        print()
-        
-        # Test empty query
-        result = internet_research("")
-        print("✅ Empty query handling:")
-        print(result)
-        print()
-        
-        # Test research_correlations error
-        result = research_correlations("test topic", "test insights")
-        print("✅ Research correlations error handling:")
-        print(result)
-        print()
+    # Test internet_research error
+    result = internet_research("test query")
+    assert "error" in result.lower()
+    
+    # Test empty query
+    result = internet_research("")
+    assert isinstance(result, str) and result
+    
+    # Test research_correlations error
+    result = research_correlations("test topic", "test insights")
+    assert "error" in result.lower()
 
 def test_exa_researcher_initialization():
     """Test ExaResearcher initialization and configuration"""
-    print("🔍 Testing ExaResearcher initialization...")
-    
     # Test with missing API key
     with patch.dict(os.environ, {}, clear=True):
-        try:
-            from research_agent.tools.research import ExaResearcher
-            researcher = ExaResearcher()
-            print("❌ Should have raised EnvironmentError")
-        except EnvironmentError as e:
-            print("✅ Proper error handling for missing API key:")
-            print(str(e))
-            print()
+        with pytest.raises(EnvironmentError):
+            ExaResearcher()
     
     # Test with valid API key
     with patch.dict(os.environ, {'EXA_API_KEY': 'test-key-123'}):
         with patch('research_agent.tools.research.OpenAI') as mock_openai:
-            from research_agent.tools.research import ExaResearcher
-            
-            researcher = ExaResearcher()
-            print("✅ ExaResearcher initialized successfully with API key")
+            ExaResearcher()
             
             # Verify OpenAI client was configured correctly
             mock_openai.assert_called_once_with(
                 base_url="https://api.exa.ai",
                 api_key="test-key-123"
             )
-            print("✅ OpenAI client configured with correct parameters")
-            print()
-
-def main():
-    """Run all research tool tests"""
-    print("🧪 Testing Research Tools") 
-    print("=" * 50)
-    
-    test_exa_researcher_initialization()
-    test_internet_research()
-    test_research_correlations()
-    test_research_error_handling()
-    
-    print("✅ All research tool tests completed!")
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file